@@ -0,0 +1,38 @@
+"""index vrf target route_target_id
+
+Revision ID: 5b2d7e4a9c13
+Revises: 3819781cb08b
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# Import the UUIDType and IPNetworkType directly here to avoid import issues
+import sys
+import os
+# Add the backend directory to sys.path
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, backend_dir)
+# Now import the types
+from app.types import UUIDType
+from app.models.fields import IPNetworkType
+
+# revision identifiers, used by Alembic.
+revision = '5b2d7e4a9c13'
+down_revision = '3819781cb08b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_ipam_vrf_import_targets_route_target_id'), 'vrf_import_targets', ['route_target_id'], unique=False, schema='ipam')
+    op.create_index(op.f('ix_ipam_vrf_export_targets_route_target_id'), 'vrf_export_targets', ['route_target_id'], unique=False, schema='ipam')
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ipam_vrf_export_targets_route_target_id'), table_name='vrf_export_targets', schema='ipam')
+    op.drop_index(op.f('ix_ipam_vrf_import_targets_route_target_id'), table_name='vrf_import_targets', schema='ipam')
@@ -5,8 +5,6 @@ from ..database import get_session
 from ..models import Prefix, VRF
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 # Create router for specialized endpoints
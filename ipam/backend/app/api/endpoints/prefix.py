@@ -1,14 +1,15 @@
 from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
 from pydantic import BaseModel
-from ...database import get_session
+from ...database import engine, get_session
 from ...models import Prefix, IPAddress
 import ipaddress
+import json
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 # Define request and response models
@@ -38,7 +39,7 @@ def get_prefix_hierarchy(
         List of prefixes with hierarchical information
     """
     try:
-        from ...crud import prefix as prefix_crud
+        from ...crud_legacy import prefix as prefix_crud
         prefixes = prefix_crud.get_hierarchy(session, vrf_id)
         return {
             "items": prefixes,
@@ -47,6 +48,28 @@ def get_prefix_hierarchy(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving prefix hierarchy: {str(e)}")
 
+@router.get("/prefixes/hierarchy/stream")
+def stream_prefix_hierarchy(vrf_id: Optional[int] = None):
+    """
+    Stream prefixes in a hierarchical structure as newline-delimited JSON.
+    
+    Unlike /prefixes/hierarchy, rows are sent as they are read, so large VRFs are
+    never materialized in memory.
+    
+    Args:
+        vrf_id: Optional VRF ID to filter by
+    """
+    from ...crud_legacy import prefix as prefix_crud
+    
+    def generate_ndjson():
+        # The generator owns its session: a yield dependency may be closed before
+        # the response body has been streamed
+        with Session(engine, expire_on_commit=False) as session:
+            for prefix_dict in prefix_crud.iter_hierarchy(session, vrf_id):
+                yield json.dumps(jsonable_encoder(prefix_dict)) + "\n"
+    
+    return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
 @router.get("/prefixes/{prefix_id}/utilization")
 def get_prefix_utilization(
     prefix_id: int,
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session, select, inspect
 from typing import Dict, Any, List, Union, Optional
+import json
 import logging
 from uuid import UUID
 
+# Same optional encoder as CustomJSONResponse.render
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import database engine and session
 from ..database import engine, get_session
 
@@ -66,50 +73,83 @@ model_mapping = {
     'arp_table': ARP
 }
 
-@router.get("/schema/{table_name}", tags=["Schema Information"])
-def get_table_schema(table_name: str) -> Dict[str, Any]:
+# Encoded /schema/{table_name} responses; table schemas don't change while the
+# process runs, so the catalog queries only need to run once per table
+_SCHEMA_CACHE: Dict[str, bytes] = {}
+
+def _schema_for(inspector, table_name: str) -> Dict[str, Any]:
+    columns = inspector.get_columns(table_name)
+    foreign_keys = inspector.get_foreign_keys(table_name)
+    schema = {
+        "table_name": table_name,
+        "columns": [],
+        "foreign_keys": []
+    }
+    for column in columns:
+        col_info = {
+            "name": column["name"],
+            "type": str(column["type"]),
+            "nullable": column["nullable"],
+            "default": str(column["default"]) if column["default"] is not None else None,
+            "primary_key": column.get("primary_key", False)
+        }
+        schema["columns"].append(col_info)
+    for fk in foreign_keys:
+        fk_info = {
+            "constrained_columns": fk["constrained_columns"],
+            "referred_table": fk["referred_table"],
+            "referred_columns": fk["referred_columns"]
+        }
+        schema["foreign_keys"].append(fk_info)
+    return schema
+
+def _encode_schema(inspector, table_name: str) -> bytes:
+    schema = _schema_for(inspector, table_name)
+    if orjson is not None:
+        payload = orjson.dumps(schema)
+    else:
+        payload = json.dumps(schema, separators=(",", ":")).encode("utf-8")
+    _SCHEMA_CACHE[table_name] = payload
+    return payload
+
+def warm_schema_cache() -> None:
+    """Encode the schema response of every known table, sharing one inspector."""
+    inspector = inspect(engine)
+    for table_name in model_mapping:
+        _encode_schema(inspector, table_name)
+
+@router.get(
+    "/schema/{table_name}",
+    tags=["Schema Information"],
+    response_class=Response,
+    responses={
+        200: {
+            "description": "Columns and foreign keys of the table",
+            "content": {"application/json": {"schema": {"type": "object"}}},
+        },
+        404: {"description": "Unknown table"},
+    },
+)
+def get_table_schema(table_name: str) -> Response:
     if table_name not in model_mapping:
         raise HTTPException(status_code=404, detail=f"Table {table_name} not found")
-    try:
-        inspector = inspect(engine)
-        columns = inspector.get_columns(table_name)
-        foreign_keys = inspector.get_foreign_keys(table_name)
-        schema = {
-            "table_name": table_name,
-            "columns": [],
-            "foreign_keys": []
-        }
-        for column in columns:
-            col_info = {
-                "name": column["name"],
-                "type": str(column["type"]),
-                "nullable": column["nullable"],
-                "default": str(column["default"]) if column["default"] is not None else None,
-                "primary_key": column.get("primary_key", False)
-            }
-            schema["columns"].append(col_info)
-        for fk in foreign_keys:
-            fk_info = {
-                "constrained_columns": fk["constrained_columns"],
-                "referred_table": fk["referred_table"],
-                "referred_columns": fk["referred_columns"]
-            }
-            schema["foreign_keys"].append(fk_info)
-        return schema 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting schema for {table_name}: {str(e)}")
+    payload = _SCHEMA_CACHE.get(table_name)
+    if payload is None:
+        try:
+            payload = _encode_schema(inspect(engine), table_name)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error getting schema for {table_name}: {str(e)}")
+    # Already encoded, so skip response-model validation and serialization
+    return Response(content=payload, media_type="application/json")
 
 # The reference endpoint has been moved to app/api/endpoints/reference.py
 
+# The table URL map only depends on model_mapping, so it is built once at import
+ALL_TABLE_URLS: Dict[str, str] = {table: f"/api/v1/{table}" for table in model_mapping}
+
 @router.get("/all-tables", tags=["Schema Information"])
 def get_all_tables() -> Dict[str, str]:
-    try:
-        tables = list(model_mapping.keys())
-        base_url = "/api/v1" 
-        urls = {table: f"{base_url}/{table}" for table in tables}
-        return urls
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting tables: {str(e)}")
+    return ALL_TABLE_URLS
 
 # Define device inventory handlers only if DeviceInventoryRead is available
 if DeviceInventoryRead:
@@ -138,6 +178,14 @@ if DeviceInventoryRead:
         num_deleted = crud.device_inventory.remove_by_device_uuid(session=session, device_uuid=device_uuid)
         return {"message": "Device inventory deleted successfully", "deleted_count": num_deleted}
 
+@router.post("/vrfs/bulk", status_code=201, response_model=List[vrf.VRFReadWithTargets], tags=["VRFs"])
+def bulk_create_vrfs(items: List[vrf.VRFCreate], session: Session = Depends(get_session)):
+    """
+    Create many VRFs, with their import and export targets, in one transaction.
+    """
+    rows = [item.model_dump() for item in items]
+    return crud.vrf.bulk_create(session, rows)
+
 # Organizational Routes
 crud_router.create_crud_routes(router, "regions", crud.region, crud.region, Region, organizational.RegionCreate, organizational.RegionUpdate, ReadSchema=organizational.RegionRead, tags=["Regions"])
 crud_router.create_crud_routes(router, "site_groups", crud.site_group, crud.site_group, SiteGroup, organizational.SiteGroupCreate, organizational.SiteGroupUpdate, ReadSchema=organizational.SiteGroupRead, tags=["Site Groups"])
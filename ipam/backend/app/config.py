@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from urllib.parse import quote_plus
+from typing import Optional
 
 class Settings(BaseSettings):
     POSTGRES_USER: str = "postgres"
@@ -7,6 +8,12 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str = "localhost"
     POSTGRES_PORT: str = "5432"
     POSTGRES_DB: str = "netdata"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # Create tables and RLS policies at startup; disable where migrations own the schema
+    RUN_STARTUP_DDL: bool = True
+    # Optional read replica for read-only endpoints; reads use the primary when unset
+    DATABASE_REPLICA_URL: Optional[str] = None
 
     @property
     def DATABASE_URL(self) -> str:
@@ -3,8 +3,16 @@ CRUD operations for all models in the IPAM system.
 This module provides generic and specific CRUD operations for database models.
 """
 
-from typing import Dict, Any, TypeVar, Optional, List
+import csv
+import io
+import json
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Any, TypeVar, Optional, List, Iterable, Iterator
 from fastapi import HTTPException
+from sqlalchemy import and_, bindparam, delete, func, insert, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import defer, raiseload, selectinload
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 from .utils import slugify
@@ -23,115 +31,241 @@ logger = logging.getLogger(__name__)
 # Generic type for SQLModel models
 T = TypeVar('T')
 
-# Create CRUD instances for each model
-class RegionCRUD:
+# Rows fetched per round trip when get_all streams its results
+STREAM_BATCH_SIZE = 500
+
+# Upper bound on cached get_all statements in _filtered_select
+STATEMENT_CACHE_SIZE = 128
+
+# Bulk creates at or above this many rows are written with COPY instead of INSERT
+COPY_THRESHOLD = 100
+
+# Status code and message for VLAN group creation errors, keyed by violated
+# constraint name: a duplicate id is a conflict, a missing site a bad reference
+_VLAN_GROUP_INTEGRITY_ERRORS = {
+    "vlan_groups_pkey": (409, "A VLAN group with this ID already exists"),
+    "vlan_groups_site_id_fkey": (400, "The specified site does not exist"),
+}
+
+@lru_cache(maxsize=4096)
+def _slug(name: str) -> str:
     """
-    CRUD operations for Regions.
+    Cached slugify for names that recur across creates, updates and bulk imports.
     """
-    def get_all(self, session: Session, skip: int = 0, limit: int = 100, **kwargs) -> list[Region]:
-        """
-        Get all regions with optional pagination and filtering.
-        """
-        try:
-            logger.debug(f"RegionCRUD get_all: skip={skip}, limit={limit}, kwargs={kwargs}")
-            
-            query = select(Region)
-            
-            # Apply filters from kwargs
-            for key, value in kwargs.items():
-                if hasattr(Region, key) and value is not None:
-                    logger.debug(f"Applying filter: {key}={value}")
-                    query = query.where(getattr(Region, key) == value)
-                else:
-                    if not hasattr(Region, key):
-                        logger.warning(f"Model Region does not have attribute {key}")
-            
-            logger.debug(f"Executing query: {query}")
-            result = session.exec(query.offset(skip).limit(limit)).all()
-            logger.debug(f"Query returned {len(result)} results")
-            return result
-        except Exception as e:
-            logger.error(f"Error in RegionCRUD get_all: {str(e)}", exc_info=True)
-            raise
+    return slugify(name)
+
+def _constraint_name(error: IntegrityError) -> Optional[str]:
+    """
+    Name of the constraint an IntegrityError violated, from the psycopg2 diagnostics.
+    """
+    return getattr(getattr(error.orig, "diag", None), "constraint_name", None)
+
+def _violates(error: IntegrityError, constraint: str) -> bool:
+    """
+    Whether error violated the named constraint.
     
-    def get_by_id(self, session: Session, id: int) -> Optional[Region]:
-        """
-        Get a region by its ID.
-        """
-        return session.get(Region, id)
+    Falls back to scanning the error text only when the driver reports no name.
+    """
+    name = _constraint_name(error)
+    if name:
+        return name == constraint
+    return constraint in str(error)
+
+@lru_cache(maxsize=None)
+def _cols(model) -> frozenset:
+    """
+    Names of the table columns of a model, computed once per model class.
+    """
+    return frozenset(model.__table__.columns.keys())
+
+@lru_cache(maxsize=None)
+def _insert_returning(model):
+    """
+    INSERT ... RETURNING for model, built once per model class.
+    """
+    return insert(model).returning(model)
+
+def _insert_row(session: Session, model, obj_in: Dict[str, Any]) -> Any:
+    """
+    Insert one row and return it as an ORM instance in a single round trip.
     
-    def create(self, session: Session, obj_in: Dict[str, Any]) -> Region:
-        """
-        Create a new Region with validation for unique name.
-        """
+    The model instance only applies the Python-side defaults (ids, timestamps); the
+    row itself is written by the prepared INSERT ... RETURNING, so no flush or
+    refresh SELECT is needed. Not for models with server-generated columns.
+    """
+    db_obj = model(**obj_in)
+    values = {key: getattr(db_obj, key) for key in _cols(model)}
+    return session.execute(_insert_returning(model), [values]).scalar_one()
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _filtered_select(model, keys: frozenset, options: tuple = (), keyset: bool = False, with_total: bool = False, defer_cols: tuple = ()):
+    """
+    SELECT for model filtered on keys, with filter values, offset and limit as bind parameters.
+    
+    With keyset=True the page starts after the _after_id bind parameter in id order
+    instead of at an offset, so deep pages are an index range scan rather than a
+    scan over every skipped row.
+    
+    With with_total=True each row also carries count(*) OVER () as "total": the
+    number of rows matching the filters before offset and limit apply. Only
+    meaningful for offset pages, since the keyset condition is itself a filter.
+    
+    Columns in defer_cols are left unloaded.
+    
+    Built once per model, key-set and loader options, so the statement (and the
+    compiled SQL cached against it) is reused across requests. Filter keys come from
+    query strings, so the cache is bounded by STATEMENT_CACHE_SIZE.
+    """
+    statement = select(model, func.count().over().label("total")) if with_total else select(model)
+    if options:
+        statement = statement.options(*options)
+    if defer_cols:
+        statement = statement.options(*(defer(getattr(model, col)) for col in defer_cols))
+    for key in sorted(keys):
+        statement = statement.where(getattr(model, key) == bindparam(key))
+    if keyset:
+        return statement.where(model.id > bindparam("_after_id")).order_by(model.id).limit(bindparam("_limit"))
+    return statement.offset(bindparam("_skip")).limit(bindparam("_limit"))
+
+def _get_many(session: Session, model, ids: Iterable[Any]) -> Dict[Any, Any]:
+    """
+    Load the rows of model with the given ids in one IN query, keyed by id.
+    """
+    ids = list(ids)
+    if not ids:
+        return {}
+    rows = session.execute(select(model).where(model.id.in_(ids))).scalars().all()
+    return {row.id: row for row in rows}
+
+def _get_columns(session: Session, model, id: Any, columns: tuple) -> Any:
+    """
+    Select only the given columns of one row: a bare value for a single column,
+    otherwise a row tuple. Returns None when no row matches.
+    """
+    statement = select(*(getattr(model, column) for column in columns)).where(model.id == id)
+    result = session.execute(statement)
+    if len(columns) == 1:
+        return result.scalar_one_or_none()
+    return result.one_or_none()
+
+def _array_literal(items: Iterable[Any]) -> str:
+    """
+    Render a list as a PostgreSQL array literal, e.g. {"a","b",NULL}.
+    """
+    parts = []
+    for item in items:
+        if item is None:
+            parts.append("NULL")
+        elif isinstance(item, (list, tuple)):
+            parts.append(_array_literal(item))
+        else:
+            text = str(item).replace("\\", "\\\\").replace('"', '\\"')
+            parts.append(f'"{text}"')
+    return "{" + ",".join(parts) + "}"
+
+def _copy_value(value: Any) -> Any:
+    """
+    Render a bind-processed column value for the CSV stream fed to COPY.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, (list, tuple)):
+        return _array_literal(value)
+    if isinstance(value, dict):
+        # JSON columns whose dialect leaves serialization to the driver
+        return json.dumps(value)
+    return value
+
+def _bulk_insert(session: Session, model, rows: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Insert plain row dicts in a single pass and return the new ids.
+    
+    Model instances are only built to apply Python-side defaults (ids, timestamps).
+    Batches of COPY_THRESHOLD rows or more are streamed through PostgreSQL COPY on
+    the raw psycopg2 cursor; smaller ones use a bulk INSERT without per-row flushes.
+    The caller is responsible for committing.
+    """
+    columns = [column.name for column in model.__table__.columns if column.server_default is None]
+    values = []
+    for row in rows:
+        obj = model(**row)
+        values.append({key: getattr(obj, key) for key in columns})
+    
+    if len(values) < COPY_THRESHOLD:
+        session.bulk_insert_mappings(model, values)
+    else:
+        # COPY bypasses SQLAlchemy's type handling, so run each value through its
+        # column's bind processor first, as an INSERT would (enum names, JSON text,
+        # custom types), then render it as COPY input
+        dialect = session.get_bind().dialect
+        table_columns = model.__table__.columns
+        processors = [(key, table_columns[key].type.bind_processor(dialect)) for key in columns]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for value in values:
+            writer.writerow([
+                _copy_value(process(value[key]) if process and value[key] is not None else value[key])
+                for key, process in processors
+            ])
+        buffer.seek(0)
+        
+        column_list = ", ".join(f'"{key}"' for key in columns)
+        cursor = session.connection().connection.cursor()
         try:
-            # Create the Region using the base method
-            name_value = obj_in.get('name')
-            
-            db_obj = Region(**obj_in)
-            session.add(db_obj)
-            session.commit()
-            session.refresh(db_obj)
-            return db_obj
-        except IntegrityError as e:
-            # Rollback the session in case of error
-            session.rollback()
-            
-            # Check if it's a unique constraint violation for name
-            error_message = str(e)
-            if "uq_region_name" in error_message:
-                raise HTTPException(
-                    status_code=409,
-                    detail={
-                        "detail": f"Region with name '{name_value}' already exists. Please use a different name.",
-                        "error_type": "unique_violation",
-                        "constraint": "uq_region_name",
-                        "name": name_value
-                    }
-                )
-            
-            # Re-raise the exception for other errors
-            raise
+            cursor.copy_expert(
+                f"COPY {model.__table__.fullname} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer
+            )
+        finally:
+            cursor.close()
     
-    def update_region(self, db: Session, id: int, obj_in) -> Optional[Region]:
-        """
-        Update a region by ID.
-        """
-        db_obj = db.get(Region, id)
-        if not db_obj:
-            return None
-            
-        # Convert Pydantic model to dict if it's not already a dict
-        update_data = obj_in
-        if not isinstance(obj_in, dict):
-            update_data = obj_in.dict(exclude_unset=True)
-            
-        # Auto-generate slug if name is updated and slug is not provided
-        if 'name' in update_data and update_data['name'] and ('slug' not in update_data or not update_data['slug']):
-            update_data['slug'] = slugify(update_data['name'])
-            logger.debug(f"Auto-generated slug '{update_data['slug']}' from updated name '{update_data['name']}'")
-            
-        # Update object attributes
-        for key, value in update_data.items():
-            if hasattr(db_obj, key):
-                setattr(db_obj, key, value)
-                
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+    return [value["id"] for value in values]
+
+def _rebuild_prefix_hierarchy(session: Session, vrf_ids: set) -> None:
+    """
+    Recompute parent_id, depth and child_count for every prefix in the given VRFs.
     
-    def remove(self, db: Session, *, id: int) -> Optional[Region]:
-        """
-        Delete a region by ID.
-        """
-        obj = db.get(Region, id)
-        if not obj:
-            return None
-            
-        db.delete(obj)
-        db.commit()
-        return obj
+    Runs as two set-based UPDATEs instead of one update_hierarchy walk per prefix.
+    A prefix's parent is its most specific strict supernet (<<) in the same VRF, and
+    its depth is the number of such supernets, which matches update_hierarchy.
+    """
+    prefixes = Prefix.__table__
+    parents = prefixes.alias("parents")
+    children = prefixes.alias("children")
+    
+    vrf_scope = [prefixes.c.vrf_id.in_([vrf_id for vrf_id in vrf_ids if vrf_id is not None])]
+    if None in vrf_ids:
+        vrf_scope.append(prefixes.c.vrf_id.is_(None))
+    
+    supernets = and_(
+        parents.c.vrf_id.is_not_distinct_from(prefixes.c.vrf_id),
+        prefixes.c.prefix.op("<<")(parents.c.prefix),
+    )
+    parent_id = (
+        select(parents.c.id)
+        .where(supernets)
+        .order_by(func.masklen(parents.c.prefix).desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    depth = select(func.count()).select_from(parents).where(supernets).scalar_subquery()
+    session.execute(update(prefixes).where(or_(*vrf_scope)).values(parent_id=parent_id, depth=depth))
+    
+    child_count = (
+        select(func.count())
+        .select_from(children)
+        .where(children.c.parent_id == prefixes.c.id)
+        .scalar_subquery()
+    )
+    session.execute(update(prefixes).where(or_(*vrf_scope)).values(child_count=child_count))
+
+# Columns returned by PrefixCRUD.get_hierarchy
+_HIERARCHY_COLUMNS = (
+    Prefix.id, Prefix.prefix, Prefix.status, Prefix.vrf_id, Prefix.site_id,
+    Prefix.tenant_id, Prefix.depth, Prefix.parent_id, Prefix.child_count,
+    Prefix.description, Prefix.is_pool, Prefix.mark_utilized, Prefix.vlan_id,
+    Prefix.role_id,
+)
 
 class PrefixCRUD:
     """
@@ -143,22 +277,33 @@ class PrefixCRUD:
         Get all prefixes with optional pagination and filtering.
         """
         try:
-            logger.debug(f"PrefixCRUD get_all: skip={skip}, limit={limit}, kwargs={kwargs}")
+            # Skip building DEBUG diagnostics when they would be discarded
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("PrefixCRUD get_all: skip=%s, limit=%s, kwargs=%s", skip, limit, kwargs)
             
-            query = select(Prefix)
+            params: Dict[str, Any] = {}
             
             # Apply filters from kwargs
+            columns = _cols(Prefix)
             for key, value in kwargs.items():
-                if hasattr(Prefix, key) and value is not None:
-                    logger.debug(f"Applying filter: {key}={value}")
-                    query = query.where(getattr(Prefix, key) == value)
+                if key in columns and value is not None:
+                    if debug:
+                        logger.debug("Applying filter: %s=%s", key, value)
+                    params[key] = value
                 else:
-                    if not hasattr(Prefix, key):
-                        logger.warning(f"Model Prefix does not have attribute {key}")
+                    if key not in columns:
+                        logger.warning("Model Prefix does not have attribute %s", key)
+            
+            query = _filtered_select(Prefix, frozenset(params))
+            params["_skip"] = skip
+            params["_limit"] = limit
             
-            logger.debug(f"Executing query: {query}")
-            result = session.exec(query.offset(skip).limit(limit)).all()
-            logger.debug(f"Query returned {len(result)} results")
+            if debug:
+                logger.debug("Executing query: %s", query)
+            result = session.execute(query, params).scalars().all()
+            if debug:
+                logger.debug("Query returned %s results", len(result))
             
             # Convert IPv4Network/IPv6Network objects to strings before returning
             for prefix_obj in result:
@@ -176,7 +321,7 @@ class PrefixCRUD:
             
             return result
         except Exception as e:
-            logger.error(f"Error in PrefixCRUD get_all: {str(e)}", exc_info=True)
+            logger.error("Error in PrefixCRUD get_all: %s", e, exc_info=True)
             raise
     
     def get_by_id(self, session: Session, id: int) -> Optional[Prefix]:
@@ -184,7 +329,7 @@ class PrefixCRUD:
         Get a prefix by its ID.
         """
         try:
-            logger.debug(f"PrefixCRUD get_by_id: id={id}")
+            logger.debug("PrefixCRUD get_by_id: id=%s", id)
             
             # Get the prefix by ID
             prefix = session.get(Prefix, id)
@@ -204,20 +349,26 @@ class PrefixCRUD:
             
             return prefix
         except Exception as e:
-            logger.error(f"Error in PrefixCRUD get_by_id: {str(e)}", exc_info=True)
+            logger.error("Error in PrefixCRUD get_by_id: %s", e, exc_info=True)
             raise
     
+    def get_many_by_ids(self, session: Session, ids: List[Any]) -> Dict[Any, Prefix]:
+        """
+        Get prefixes by ID in a single query, keyed by ID.
+        """
+        return _get_many(session, Prefix, ids)
+    
     def update_prefix(self, db: Session, id: int, obj_in) -> Optional[Prefix]:
         """
         Update a prefix by ID.
         """
         try:
-            logger.debug(f"PrefixCRUD update_prefix: id={id}, obj_in={obj_in}")
+            logger.debug("PrefixCRUD update_prefix: id=%s, obj_in=%s", id, obj_in)
             
             # Get the existing prefix
             db_obj = db.get(Prefix, id)
             if not db_obj:
-                logger.warning(f"Prefix with ID {id} not found for update")
+                logger.warning("Prefix with ID %s not found for update", id)
                 return None
             
             # Convert Pydantic model to dict if it's not already a dict
@@ -226,8 +377,9 @@ class PrefixCRUD:
                 update_data = obj_in.model_dump(exclude_unset=True) if hasattr(obj_in, 'model_dump') else obj_in.dict(exclude_unset=True)
             
             # Update object attributes
+            columns = _cols(Prefix)
             for key, value in update_data.items():
-                if hasattr(db_obj, key):
+                if key in columns:
                     setattr(db_obj, key, value)
             
             # Update hierarchical relationships
@@ -241,7 +393,7 @@ class PrefixCRUD:
             return db_obj
         except Exception as e:
             db.rollback()
-            logger.error(f"Error in PrefixCRUD update_prefix: {str(e)}", exc_info=True)
+            logger.error("Error in PrefixCRUD update_prefix: %s", e, exc_info=True)
             raise
     def create(self, session: Session, obj_in: Dict[str, Any]) -> Prefix:
         """
@@ -251,15 +403,13 @@ class PrefixCRUD:
             # Create the prefix using the base method
             db_obj = Prefix(**obj_in)
             session.add(db_obj)
-            session.commit()
-            session.refresh(db_obj)
+            session.flush()
             
-            # Update hierarchical relationships
+            # Update hierarchical relationships in the same transaction
             db_obj.update_hierarchy(session)
             
             # Commit changes
             session.commit()
-            session.refresh(db_obj)
             
             return db_obj
         except IntegrityError as e:
@@ -267,7 +417,7 @@ class PrefixCRUD:
             session.rollback()
             
             # Check for unique constraint violation
-            if "uq_prefix_vrf" in str(e):
+            if _violates(e, "uq_prefix_vrf"):
                 # Extract prefix and VRF information if possible
                 prefix_value = obj_in.get('prefix', 'unknown')
                 vrf_id = obj_in.get('vrf_id', None)
@@ -276,9 +426,8 @@ class PrefixCRUD:
                 vrf_name = "Unknown VRF"
                 if vrf_id:
                     try:
-                        vrf = session.get(VRF, vrf_id)
-                        if vrf:
-                            vrf_name = vrf.name
+                        # Only the name is needed, so don't load the whole VRF row
+                        vrf_name = vrf.get_by_id(session, vrf_id, columns=("name",)) or vrf_name
                     except Exception:
                         pass
                 
@@ -296,7 +445,7 @@ class PrefixCRUD:
                 )
             
             # Log the error
-            logger.error(f"Error creating prefix: {str(e)}", exc_info=True)
+            logger.error("Error creating prefix: %s", e, exc_info=True)
             
             # Re-raise the exception to be handled by the global exception handler
             raise
@@ -305,11 +454,28 @@ class PrefixCRUD:
             session.rollback()
             
             # Log the error
-            logger.error(f"Error creating prefix: {str(e)}", exc_info=True)
+            logger.error("Error creating prefix: %s", e, exc_info=True)
             
             # Re-raise the exception to be handled by the global exception handler
             raise
     
+    def bulk_create(self, session: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Create many prefixes at once and update hierarchical relationships in one transaction.
+        """
+        try:
+            ids = _bulk_insert(session, Prefix, rows)
+            
+            # Recompute the hierarchy of the touched VRFs in SQL once the whole batch is visible
+            _rebuild_prefix_hierarchy(session, {row.get('vrf_id') for row in rows})
+            
+            session.commit()
+            return len(ids)
+        except Exception as e:
+            session.rollback()
+            logger.error("Error bulk creating prefixes: %s", e, exc_info=True)
+            raise
+    
     def update(self, session: Session, id: int, obj_in: Dict[str, Any]) -> Optional[Prefix]:
         """
         Update a prefix and update hierarchical relationships if needed.
@@ -325,21 +491,20 @@ class PrefixCRUD:
             vrf_changing = 'vrf_id' in obj_in and obj_in['vrf_id'] != db_obj.vrf_id
             
             # Update the prefix using the base method
+            columns = _cols(Prefix)
             for key, value in obj_in.items():
-                if hasattr(db_obj, key):
+                if key in columns:
                     setattr(db_obj, key, value)
             
             session.add(db_obj)
-            session.commit()
-            session.refresh(db_obj)
+            session.flush()
             
-            # If the prefix or VRF changed, update hierarchical relationships
+            # If the prefix or VRF changed, update hierarchical relationships in the same transaction
             if prefix_changing or vrf_changing:
                 db_obj.update_hierarchy(session)
             
             # Commit changes
             session.commit()
-            session.refresh(db_obj)
             
             return db_obj
         except Exception as e:
@@ -347,7 +512,7 @@ class PrefixCRUD:
             session.rollback()
             
             # Log the error
-            logger.error(f"Error updating prefix: {str(e)}", exc_info=True)
+            logger.error("Error updating prefix: %s", e, exc_info=True)
             
             # Re-raise the exception to be handled by the global exception handler
             raise
@@ -362,12 +527,14 @@ class PrefixCRUD:
             if not db_obj:
                 return False
             
-            # Update parent's child count if this prefix has a parent
+            # Decrement the parent's child count in the database rather than loading the parent
             if db_obj.parent_id:
-                parent = session.get(Prefix, db_obj.parent_id)
-                if parent:
-                    parent.child_count = max(0, parent.child_count - 1)
-                    session.add(parent)
+                session.execute(
+                    update(Prefix)
+                    .where(Prefix.id == db_obj.parent_id)
+                    .values(child_count=func.greatest(Prefix.child_count - 1, 0))
+                    .execution_options(synchronize_session=False)
+                )
             
             # Delete the prefix using the base method
             session.delete(db_obj)
@@ -378,55 +545,48 @@ class PrefixCRUD:
             session.rollback()
             
             # Log the error
-            logger.error(f"Error deleting prefix: {str(e)}", exc_info=True)
+            logger.error("Error deleting prefix: %s", e, exc_info=True)
             
             # Re-raise the exception to be handled by the global exception handler
             raise
     
-    def get_hierarchy(self, session: Session, vrf_id: Optional[int] = None) -> list[Dict[str, Any]]:
+    def iter_hierarchy(self, session: Session, vrf_id: Optional[int] = None) -> Iterator[Dict[str, Any]]:
         """
-        Get prefixes in a hierarchical structure.
+        Yield prefixes with hierarchical information one dict at a time.
+        
+        Rows are fetched from a server-side cursor in batches of STREAM_BATCH_SIZE,
+        so memory stays bounded however many prefixes the VRF holds. Must be
+        consumed while the session is open.
         
         Args:
             session: Database session
             vrf_id: Optional VRF ID to filter by
-            
-        Returns:
-            List of prefixes with hierarchical information
         """
-        # Query for all prefixes, optionally filtered by VRF
-        query = select(Prefix)
+        # Select only the columns the hierarchy view needs; rows come back as mappings,
+        # so no Prefix instances are built. depth and parent_id are maintained by
+        # update_hierarchy, and CIDR ordering lists each parent before its children.
+        query = select(*_HIERARCHY_COLUMNS)
         if vrf_id is not None:
             query = query.where(Prefix.vrf_id == vrf_id)
         
         # Order by prefix to ensure consistent results
-        query = query.order_by(Prefix.prefix)
+        query = query.order_by(Prefix.prefix).execution_options(yield_per=STREAM_BATCH_SIZE)
         
-        prefixes = session.exec(query).all()
-        
-        # Convert to dictionaries with additional hierarchical information
-        result = []
-        for prefix in prefixes:
-            # Only include fields that exist in the database
-            prefix_dict = {
-                "id": prefix.id,
-                "prefix": prefix.prefix,
-                "status": prefix.status,
-                "vrf_id": prefix.vrf_id,
-                "site_id": prefix.site_id,
-                "tenant_id": prefix.tenant_id,
-                "depth": prefix.depth,
-                "parent_id": prefix.parent_id,
-                "child_count": prefix.child_count,
-                "description": prefix.description,
-                "is_pool": prefix.is_pool,
-                "mark_utilized": prefix.mark_utilized,
-                "vlan_id": prefix.vlan_id,
-                "role_id": prefix.role_id
-            }
-            result.append(prefix_dict)
+        for row in session.execute(query).mappings():
+            yield dict(row)
+    
+    def get_hierarchy(self, session: Session, vrf_id: Optional[int] = None) -> list[Dict[str, Any]]:
+        """
+        Get prefixes in a hierarchical structure.
         
-        return result
+        Args:
+            session: Database session
+            vrf_id: Optional VRF ID to filter by
+            
+        Returns:
+            List of prefixes with hierarchical information
+        """
+        return list(self.iter_hierarchy(session, vrf_id))
 
 class IPAddressCRUD:
     """
@@ -446,18 +606,21 @@ class IPAddressCRUD:
         Returns:
             List of IPAddress objects
         """
-        query = select(IPAddress)
+        params: Dict[str, Any] = {}
         
         # Apply filters if provided
+        columns = _cols(IPAddress)
         for key, value in kwargs.items():
-            if hasattr(IPAddress, key) and value is not None:
-                query = query.where(getattr(IPAddress, key) == value)
+            if key in columns and value is not None:
+                params[key] = value
         
         # Apply pagination
-        query = query.offset(skip).limit(limit)
+        query = _filtered_select(IPAddress, frozenset(params))
+        params["_skip"] = skip
+        params["_limit"] = limit
         
         # Execute query and return results
-        result = session.exec(query).all()
+        result = session.execute(query, params).scalars().all()
         return result
         
     def get_by_id(self, session: Session, id: int) -> Optional[IPAddress]:
@@ -472,6 +635,12 @@ class IPAddressCRUD:
             IPAddress object if found, None otherwise
         """
         return session.get(IPAddress, id)
+    
+    def get_many_by_ids(self, session: Session, ids: List[Any]) -> Dict[Any, IPAddress]:
+        """
+        Get IP addresses by ID in a single query, keyed by ID.
+        """
+        return _get_many(session, IPAddress, ids)
         
     def update_ip_address(self, db: Session, id: int, obj_in) -> Optional[IPAddress]:
         """
@@ -499,8 +668,9 @@ class IPAddressCRUD:
                 update_data = obj_in.dict(exclude_unset=True)
                 
             # Update the IP address fields
+            columns = _cols(IPAddress)
             for key, value in update_data.items():
-                if hasattr(db_obj, key) and value is not None:
+                if key in columns and value is not None:
                     setattr(db_obj, key, value)
             
             # Commit the changes
@@ -511,7 +681,7 @@ class IPAddressCRUD:
             return db_obj
         except Exception as e:
             db.rollback()
-            logger.error(f"Error updating IP address {id}: {str(e)}", exc_info=True)
+            logger.error("Error updating IP address %s: %s", id, e, exc_info=True)
             raise
     def create(self, session: Session, obj_in: Dict[str, Any]) -> IPAddress:
         """
@@ -519,35 +689,34 @@ class IPAddressCRUD:
         """
         try:
             # Log the input data for debugging
-            logger.debug(f"Creating IP address with data: {obj_in}")
+            logger.debug("Creating IP address with data: %s", obj_in)
             
             # Create the IP address using the base method
             address_value = obj_in.get('address')
             vrf_id = obj_in.get('vrf_id')
             prefix_id = obj_in.get('prefix_id')
-            vrf_name = "global"
             
             # Log the extracted values
-            logger.debug(f"Extracted values: address={address_value}, vrf_id={vrf_id}, prefix_id={prefix_id}")
+            logger.debug("Extracted values: address=%s, vrf_id=%s, prefix_id=%s", address_value, vrf_id, prefix_id)
             
-            if vrf_id:
-                # Try to get the VRF name for better error messages
-                vrf = session.get(VRF, vrf_id)
-                if vrf:
-                    vrf_name = vrf.name
-            
-            db_obj = IPAddress(**obj_in)
-            session.add(db_obj)
+            db_obj = _insert_row(session, IPAddress, obj_in)
             session.commit()
-            session.refresh(db_obj)
             return db_obj
         except IntegrityError as e:
             # Rollback the session in case of error
             session.rollback()
             
             # Check if it's a unique constraint violation for address+VRF
-            error_message = str(e)
-            if "uq_ipaddress_vrf" in error_message:
+            if _violates(e, "uq_ipaddress_vrf"):
+                # Look up the VRF name for the error message only when it is needed
+                vrf_name = "global"
+                if vrf_id:
+                    try:
+                        # Only the name is needed, so don't load the whole VRF row
+                        vrf_name = vrf.get_by_id(session, vrf_id, columns=("name",)) or vrf_name
+                    except Exception:
+                        pass
+                
                 raise HTTPException(
                     status_code=409,
                     detail={
@@ -562,6 +731,19 @@ class IPAddressCRUD:
             
             # Re-raise the exception for other errors
             raise
+    
+    def bulk_create(self, session: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Create many IP addresses in a single transaction.
+        """
+        try:
+            count = len(_bulk_insert(session, IPAddress, rows))
+            session.commit()
+            return count
+        except Exception as e:
+            session.rollback()
+            logger.error("Error bulk creating IP addresses: %s", e, exc_info=True)
+            raise
 
 class CredentialCRUD:
     """
@@ -583,11 +765,12 @@ class CredentialCRUD:
         statement = select(Credential).order_by(Credential.name).offset(skip).limit(limit)
         
         # Apply any filters from kwargs
+        columns = _cols(Credential)
         for key, value in kwargs.items():
-            if hasattr(Credential, key) and value is not None:
+            if key in columns and value is not None:
                 statement = statement.where(getattr(Credential, key) == value)
                 
-        return session.exec(statement).all()
+        return session.execute(statement).scalars().all()
     def create(self, session: Session, obj_in: Dict[str, Any]) -> Credential:
         """
         Create a new credential with validation for unique name.
@@ -596,18 +779,15 @@ class CredentialCRUD:
             # Create the credential using the base method
             name_value = obj_in.get('name')
             
-            db_obj = Credential(**obj_in)
-            session.add(db_obj)
+            db_obj = _insert_row(session, Credential, obj_in)
             session.commit()
-            session.refresh(db_obj)
             return db_obj
         except IntegrityError as e:
             # Rollback the session in case of error
             session.rollback()
             
             # Check if it's a unique constraint violation for name
-            error_message = str(e)
-            if "uq_credential_name" in error_message:
+            if _violates(e, "uq_credential_name"):
                 raise HTTPException(
                     status_code=409,
                     detail={
@@ -631,25 +811,36 @@ class PlatformTypeCRUD:
         Get all platform types with optional pagination and filtering.
         """
         try:
-            logger.debug(f"PlatformTypeCRUD get_all: skip={skip}, limit={limit}, kwargs={kwargs}")
+            # Skip building DEBUG diagnostics when they would be discarded
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("PlatformTypeCRUD get_all: skip=%s, limit=%s, kwargs=%s", skip, limit, kwargs)
             
-            query = select(PlatformType)
+            params: Dict[str, Any] = {}
             
             # Apply filters from kwargs
+            columns = _cols(PlatformType)
             for key, value in kwargs.items():
-                if hasattr(PlatformType, key) and value is not None:
-                    logger.debug(f"Applying filter: {key}={value}")
-                    query = query.where(getattr(PlatformType, key) == value)
+                if key in columns and value is not None:
+                    if debug:
+                        logger.debug("Applying filter: %s=%s", key, value)
+                    params[key] = value
                 else:
-                    if not hasattr(PlatformType, key):
-                        logger.warning(f"Model PlatformType does not have attribute {key}")
-            
-            logger.debug(f"Executing query: {query}")
-            result = session.exec(query.offset(skip).limit(limit)).all()
-            logger.debug(f"Query returned {len(result)} results")
+                    if key not in columns:
+                        logger.warning("Model PlatformType does not have attribute %s", key)
+            
+            query = _filtered_select(PlatformType, frozenset(params))
+            params["_skip"] = skip
+            params["_limit"] = limit
+            
+            if debug:
+                logger.debug("Executing query: %s", query)
+            result = session.execute(query, params).scalars().all()
+            if debug:
+                logger.debug("Query returned %s results", len(result))
             return result
         except Exception as e:
-            logger.error(f"Error in PlatformTypeCRUD get_all: {str(e)}", exc_info=True)
+            logger.error("Error in PlatformTypeCRUD get_all: %s", e, exc_info=True)
             raise
     
     def get_by_id(self, session: Session, id: UUID) -> Optional[PlatformType]:
@@ -657,6 +848,12 @@ class PlatformTypeCRUD:
         Get a platform type by its ID.
         """
         return session.get(PlatformType, id)
+    
+    def get_many_by_ids(self, session: Session, ids: List[Any]) -> Dict[Any, PlatformType]:
+        """
+        Get platform types by ID in a single query, keyed by ID.
+        """
+        return _get_many(session, PlatformType, ids)
 
 class NetJobCRUD:
     """
@@ -684,11 +881,12 @@ class DeviceInventoryCRUD:
         statement = select(DeviceInventory).offset(skip).limit(limit)
         
         # Apply filters from kwargs
+        columns = _cols(DeviceInventory)
         for key, value in kwargs.items():
-            if hasattr(DeviceInventory, key) and value is not None:
+            if key in columns and value is not None:
                 statement = statement.where(getattr(DeviceInventory, key) == value)
                 
-        return session.exec(statement).all()
+        return session.execute(statement).scalars().all()
     def get_by_device_uuid(self, session: Session, *, device_uuid: UUID) -> list[DeviceInventory]:
         """
         Get all inventory records for a specific device UUID.
@@ -702,12 +900,13 @@ class DeviceInventoryCRUD:
         """
         # Note: This deletes ALL history for the device.
         # Consider adding time range constraints if needed.
-        statement = select(DeviceInventory).where(DeviceInventory.device_uuid == device_uuid)
-        results = session.exec(statement).all()
-        count = len(results)
+        statement = (
+            delete(DeviceInventory)
+            .where(DeviceInventory.device_uuid == device_uuid)
+            .execution_options(synchronize_session=False)
+        )
+        count = session.execute(statement).rowcount
         if count > 0:
-            for obj in results:
-                session.delete(obj)
             session.commit()
         return count
 
@@ -720,349 +919,190 @@ class DeviceInventoryCRUD:
     ) -> DeviceInventory:
         raise NotImplementedError("DeviceInventory cannot be updated via API.")
 
-class SiteGroupCRUD:
+class BaseCRUD:
     """
-    CRUD operations for Site Groups.
+    Generic CRUD operations for models that don't need special handling.
     """
-    def get_all(self, session: Session, skip: int = 0, limit: int = 100, **kwargs) -> list[SiteGroup]:
-        """
-        Get all site groups with optional pagination and filtering.
-        """
-        try:
-            logger.debug(f"SiteGroupCRUD get_all: skip={skip}, limit={limit}, kwargs={kwargs}")
-            
-            query = select(SiteGroup)
-            
-            # Apply filters from kwargs
-            for key, value in kwargs.items():
-                if hasattr(SiteGroup, key) and value is not None:
-                    logger.debug(f"Applying filter: {key}={value}")
-                    query = query.where(getattr(SiteGroup, key) == value)
-                else:
-                    if not hasattr(SiteGroup, key):
-                        logger.warning(f"Model SiteGroup does not have attribute {key}")
-            
-            logger.debug(f"Executing query: {query}")
-            result = session.exec(query.offset(skip).limit(limit)).all()
-            logger.debug(f"Query returned {len(result)} results")
-            return result
-        except Exception as e:
-            logger.error(f"Error in SiteGroupCRUD get_all: {str(e)}", exc_info=True)
-            raise
+    __slots__ = (
+        "model_class", "defer_columns", "_model_name", "_columns", "_refresh_after_write"
+    )
     
-    def get_by_id(self, session: Session, id: int) -> Optional[SiteGroup]:
-        """
-        Get a site group by its ID.
-        """
-        return session.get(SiteGroup, id)
+    # Loader options applied to list queries. By default every relationship raises on
+    # access, so a schema that touches one fails loudly instead of issuing a SELECT per
+    # row; subclasses whose responses include relationships override this with explicit
+    # loaders, e.g. (selectinload(Model.children), raiseload('*'))
+    LOAD_OPTIONS: tuple = (raiseload('*'),)
     
-    def create(self, session: Session, obj_in: Dict[str, Any]) -> SiteGroup:
-        """
-        Create a new Site Group.
-        """
-        try:
-            db_obj = SiteGroup(**obj_in)
-            session.add(db_obj)
-            session.commit()
-            session.refresh(db_obj)
-            return db_obj
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Error creating site group: {str(e)}", exc_info=True)
-            raise
+    # Unique constraint name -> field, reported as a 409 when create or update violates it
+    UNIQUE_CONSTRAINTS: Dict[str, str] = {}
     
-    def update_site_group(self, db: Session, id: int, obj_in) -> Optional[SiteGroup]:
+    def __init__(self, model_class, defer_columns: tuple = ()):
+        self.model_class = model_class
+        self._model_name = model_class.__name__
+        # Columns left unloaded in list queries unless get_all is told otherwise
+        self.defer_columns = tuple(defer_columns)
+        # Column names, for filter and slug checks without attribute probing
+        self._columns = _cols(model_class)
+        # Build the unfiltered list statement up front; it serves most list requests
+        self._get_all_statement(frozenset(), self.defer_columns)
+        # Only models with server-generated columns need a refresh after a write
+        self._refresh_after_write = any(
+            column.server_default is not None or column.server_onupdate is not None
+            for column in model_class.__table__.columns
+        )
+    
+    def _get_all_statement(self, keys: frozenset, defer_cols: tuple = ()):
         """
-        Update a site group by ID.
+        Return the SELECT for the given filter keys, building it once per key-set.
+        
+        Statements come from the shared _filtered_select cache, so every CRUD for a
+        model reuses them, the cache has a single bound, and instances stay stateless.
         """
-        db_obj = db.get(SiteGroup, id)
-        if not db_obj:
-            return None
-            
-        # Convert Pydantic model to dict if it's not already a dict
-        update_data = obj_in
-        if not isinstance(obj_in, dict):
-            update_data = obj_in.dict(exclude_unset=True)
-            
-        # Auto-generate slug if name is updated and slug is not provided
-        if 'name' in update_data and update_data['name'] and ('slug' not in update_data or not update_data['slug']):
-            update_data['slug'] = slugify(update_data['name'])
-            logger.debug(f"Auto-generated slug '{update_data['slug']}' from updated name '{update_data['name']}'")
-            
-        # Update object attributes
-        for key, value in update_data.items():
-            if hasattr(db_obj, key):
-                setattr(db_obj, key, value)
-                
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return _filtered_select(self.model_class, keys, self.LOAD_OPTIONS, defer_cols=defer_cols)
     
-    def remove(self, db: Session, *, id: int) -> Optional[SiteGroup]:
+    def _raise_conflict(self, error: IntegrityError, data: Dict[str, Any]) -> None:
         """
-        Delete a site group by ID.
+        Raise an HTTP 409 if error violates one of the CRUD's UNIQUE_CONSTRAINTS.
         """
-        obj = db.get(SiteGroup, id)
-        if not obj:
-            return None
-            
-        db.delete(obj)
-        db.commit()
-        return obj
-
-class SiteCRUD:
-    """
-    CRUD operations for Sites.
-    """
-    def get_all(self, session: Session, skip: int = 0, limit: int = 100, **kwargs) -> list[Site]:
+        for constraint, field in self.UNIQUE_CONSTRAINTS.items():
+            if _violates(error, constraint):
+                value = data.get(field)
+                raise HTTPException(
+                    status_code=409,
+                    detail={
+                        "detail": f"{self._model_name} with {field} '{value}' already exists. Please use a different {field}.",
+                        "error_type": "unique_violation",
+                        "constraint": constraint,
+                        field: value
+                    }
+                )
+    
+    def get_all(self, session: Session, skip: int = 0, limit: int = 100, defer_cols: Optional[tuple] = None, stream: bool = False, **kwargs) -> Iterable[Any]:
         """
-        Get all sites with optional pagination and filtering.
+        Get all records with optional pagination and filtering.
+        
+        Columns in defer_cols (default: the CRUD's defer_columns) are not loaded by the
+        list query; only defer columns that the caller does not read, otherwise each
+        row lazy-loads them individually.
+        
+        With stream=True an iterator is returned that fetches rows from a server-side
+        cursor in batches of STREAM_BATCH_SIZE, for exports over large pages. It must be
+        consumed while the session is open.
         """
         try:
-            logger.debug(f"SiteCRUD get_all: skip={skip}, limit={limit}, kwargs={kwargs}")
+            # Skip building DEBUG diagnostics when they would be discarded
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("%sCRUD get_all: skip=%s, limit=%s, kwargs=%s", self._model_name, skip, limit, kwargs)
             
-            query = select(Site)
-            
-            # Apply filters from kwargs
+            # Collect filters from kwargs
+            params: Dict[str, Any] = {}
             for key, value in kwargs.items():
-                if hasattr(Site, key) and value is not None:
-                    logger.debug(f"Applying filter: {key}={value}")
-                    query = query.where(getattr(Site, key) == value)
+                if key in self._columns and value is not None:
+                    if debug:
+                        logger.debug("Applying filter: %s=%s", key, value)
+                    params[key] = value
                 else:
-                    if not hasattr(Site, key):
-                        logger.warning(f"Model Site does not have attribute {key}")
-            
-            logger.debug(f"Executing query: {query}")
-            result = session.exec(query.offset(skip).limit(limit)).all()
-            logger.debug(f"Query returned {len(result)} results")
+                    if key not in self._columns:
+                        logger.warning("Model %s does not have attribute %s", self._model_name, key)
+            
+            if defer_cols is None:
+                defer_cols = self.defer_columns
+            query = self._get_all_statement(frozenset(params), tuple(defer_cols))
+            params["_skip"] = skip
+            params["_limit"] = limit
+            
+            if debug:
+                logger.debug("Executing query: %s", query)
+            if stream:
+                return session.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE), params).scalars()
+            result = session.execute(query, params).scalars().all()
+            if debug:
+                logger.debug("Query returned %s results", len(result))
             return result
         except Exception as e:
-            logger.error(f"Error in SiteCRUD get_all: {str(e)}", exc_info=True)
+            logger.error("Error in %sCRUD get_all: %s", self._model_name, e, exc_info=True)
             raise
     
-    def get_by_id(self, session: Session, id: int) -> Optional[Site]:
+    def get_by_id(self, session: Session, id: int, *, columns: Optional[tuple] = None) -> Optional[Any]:
         """
-        Get a site by its ID.
-        """
-        return session.get(Site, id)
-    
-    def create(self, session: Session, obj_in: Dict[str, Any]) -> Site:
-        """
-        Create a new Site.
-        """
-        try:
-            db_obj = Site(**obj_in)
-            session.add(db_obj)
-            session.commit()
-            session.refresh(db_obj)
-            return db_obj
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Error creating site: {str(e)}", exc_info=True)
-            raise
-    
-    def update_site(self, db: Session, id: int, obj_in) -> Optional[Site]:
-        """
-        Update a site by ID.
-        """
-        db_obj = db.get(Site, id)
-        if not db_obj:
-            return None
-            
-        # Convert Pydantic model to dict if it's not already a dict
-        update_data = obj_in
-        if not isinstance(obj_in, dict):
-            update_data = obj_in.dict(exclude_unset=True)
-            
-        # Auto-generate slug if name is updated and slug is not provided
-        if 'name' in update_data and update_data['name'] and ('slug' not in update_data or not update_data['slug']):
-            update_data['slug'] = slugify(update_data['name'])
-            logger.debug(f"Auto-generated slug '{update_data['slug']}' from updated name '{update_data['name']}'")
-            
-        # Update object attributes
-        for key, value in update_data.items():
-            if hasattr(db_obj, key):
-                setattr(db_obj, key, value)
-                
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
-    
-    def remove(self, db: Session, *, id: int) -> Optional[Site]:
-        """
-        Delete a site by ID.
-        """
-        obj = db.get(Site, id)
-        if not obj:
-            return None
-            
-        db.delete(obj)
-        db.commit()
-        return obj
-
-class LocationCRUD:
-    """
-    CRUD operations for Locations.
-    """
-    def get_all(self, session: Session, skip: int = 0, limit: int = 100, **kwargs) -> list[Location]:
-        """
-        Get all locations with optional pagination and filtering.
+        Get a record by its ID.
+        
+        Session.get answers from the identity map when the row is already loaded in
+        this session; sessions don't expire on commit, so that stays valid after writes.
+        
+        With columns, only those columns are selected: a single name returns the bare
+        value, several return a row tuple, and None is returned if there is no match.
         """
-        try:
-            logger.debug(f"LocationCRUD get_all: skip={skip}, limit={limit}, kwargs={kwargs}")
-            
-            query = select(Location)
-            
-            # Apply filters from kwargs
-            for key, value in kwargs.items():
-                if hasattr(Location, key) and value is not None:
-                    logger.debug(f"Applying filter: {key}={value}")
-                    query = query.where(getattr(Location, key) == value)
-                else:
-                    if not hasattr(Location, key):
-                        logger.warning(f"Model Location does not have attribute {key}")
-            
-            logger.debug(f"Executing query: {query}")
-            result = session.exec(query.offset(skip).limit(limit)).all()
-            logger.debug(f"Query returned {len(result)} results")
-            return result
-        except Exception as e:
-            logger.error(f"Error in LocationCRUD get_all: {str(e)}", exc_info=True)
-            raise
+        if not columns:
+            return session.get(self.model_class, id)
+        return _get_columns(session, self.model_class, id, columns)
     
-    def get_by_id(self, session: Session, id: int) -> Optional[Location]:
+    def get_many_by_ids(self, session: Session, ids: List[Any]) -> Dict[Any, Any]:
         """
-        Get a location by its ID.
+        Get records by ID in a single IN query instead of one get_by_id per ID.
+        
+        Returns a dict keyed by ID; IDs with no matching row are absent.
         """
-        return session.get(Location, id)
+        return _get_many(session, self.model_class, ids)
     
-    def create(self, session: Session, obj_in: Dict[str, Any]) -> Location:
+    def create(self, session: Session, obj_in: Dict[str, Any]) -> Any:
         """
-        Create a new Location.
+        Create a new record.
         """
         try:
-            db_obj = Location(**obj_in)
-            session.add(db_obj)
+            # Auto-generate slug if model has name and slug fields and slug is not provided
+            if ('name' in obj_in and obj_in['name'] and 
+                'slug' in self._columns and 
+                ('slug' not in obj_in or not obj_in['slug'])):
+                obj_in['slug'] = _slug(obj_in['name'])
+                logger.debug("Auto-generated slug '%s' from name '%s'", obj_in['slug'], obj_in['name'])
+            
+            if self._refresh_after_write:
+                # Server-generated columns must be left out of the INSERT, so go through the unit of work
+                db_obj = self.model_class(**obj_in)
+                session.add(db_obj)
+                session.commit()
+                session.refresh(db_obj)
+                return db_obj
+            
+            db_obj = _insert_row(session, self.model_class, obj_in)
             session.commit()
-            session.refresh(db_obj)
             return db_obj
-        except Exception as e:
+        except IntegrityError as e:
             session.rollback()
-            logger.error(f"Error creating location: {str(e)}", exc_info=True)
+            self._raise_conflict(e, obj_in)
+            logger.error("Error creating %s: %s", self._model_name, e, exc_info=True)
             raise
-    
-    def update_location(self, db: Session, id: int, obj_in) -> Optional[Location]:
-        """
-        Update a location by ID.
-        """
-        db_obj = db.get(Location, id)
-        if not db_obj:
-            return None
-            
-        # Convert Pydantic model to dict if it's not already a dict
-        update_data = obj_in
-        if not isinstance(obj_in, dict):
-            update_data = obj_in.dict(exclude_unset=True)
-            
-        # Auto-generate slug if name is updated and slug is not provided
-        if 'name' in update_data and update_data['name'] and ('slug' not in update_data or not update_data['slug']):
-            update_data['slug'] = slugify(update_data['name'])
-            logger.debug(f"Auto-generated slug '{update_data['slug']}' from updated name '{update_data['name']}'")
-            
-        # Update object attributes
-        for key, value in update_data.items():
-            if hasattr(db_obj, key):
-                setattr(db_obj, key, value)
-                
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
-    
-    def remove(self, db: Session, *, id: int) -> Optional[Location]:
-        """
-        Delete a location by ID.
-        """
-        obj = db.get(Location, id)
-        if not obj:
-            return None
-            
-        db.delete(obj)
-        db.commit()
-        return obj
-
-class BaseCRUD:
-    """
-    Generic CRUD operations for models that don't need special handling.
-    """
-    def __init__(self, model_class):
-        self.model_class = model_class
-    
-    def get_all(self, session: Session, skip: int = 0, limit: int = 100, **kwargs) -> list[Any]:
-        """
-        Get all records with optional pagination and filtering.
-        """
-        try:
-            logger.debug(f"{self.model_class.__name__}CRUD get_all: skip={skip}, limit={limit}, kwargs={kwargs}")
-            
-            query = select(self.model_class)
-            
-            # Apply filters from kwargs
-            for key, value in kwargs.items():
-                if hasattr(self.model_class, key) and value is not None:
-                    logger.debug(f"Applying filter: {key}={value}")
-                    query = query.where(getattr(self.model_class, key) == value)
-                else:
-                    if not hasattr(self.model_class, key):
-                        logger.warning(f"Model {self.model_class.__name__} does not have attribute {key}")
-            
-            logger.debug(f"Executing query: {query}")
-            result = session.exec(query.offset(skip).limit(limit)).all()
-            logger.debug(f"Query returned {len(result)} results")
-            return result
         except Exception as e:
-            logger.error(f"Error in {self.model_class.__name__}CRUD get_all: {str(e)}", exc_info=True)
+            session.rollback()
+            logger.error("Error creating %s: %s", self._model_name, e, exc_info=True)
             raise
     
-    def get_by_id(self, session: Session, id: int) -> Optional[Any]:
-        """
-        Get a record by its ID.
-        """
-        return session.get(self.model_class, id)
-    
-    def create(self, session: Session, obj_in: Dict[str, Any]) -> Any:
+    def bulk_create(self, session: Session, rows: List[Dict[str, Any]]) -> int:
         """
-        Create a new record.
+        Create many records in a single transaction.
         """
         try:
-            # Auto-generate slug if model has name and slug fields and slug is not provided
-            if ('name' in obj_in and obj_in['name'] and 
-                hasattr(self.model_class, 'slug') and 
-                ('slug' not in obj_in or not obj_in['slug'])):
-                obj_in['slug'] = slugify(obj_in['name'])
-                logger.debug(f"Auto-generated slug '{obj_in['slug']}' from name '{obj_in['name']}'")
+            for obj_in in rows:
+                if obj_in.get('name') and 'slug' in self._columns and not obj_in.get('slug'):
+                    obj_in['slug'] = _slug(obj_in['name'])
             
-            db_obj = self.model_class(**obj_in)
-            session.add(db_obj)
+            count = len(_bulk_insert(session, self.model_class, rows))
             session.commit()
-            session.refresh(db_obj)
-            return db_obj
+            return count
         except Exception as e:
             session.rollback()
-            logger.error(f"Error creating {self.model_class.__name__}: {str(e)}", exc_info=True)
+            logger.error("Error bulk creating %s: %s", self._model_name, e, exc_info=True)
             raise
     
     def update(self, session: Session, id: int, obj_in) -> Optional[Any]:
         """
         Update a record by ID with automatic slug generation.
+        
+        Issues a single UPDATE ... RETURNING instead of SELECT, UPDATE and refresh.
         """
         try:
-            db_obj = session.get(self.model_class, id)
-            if not db_obj:
-                return None
-                
             # Convert Pydantic model to dict if it's not already a dict
             update_data = obj_in
             if not isinstance(obj_in, dict):
@@ -1070,23 +1110,38 @@ class BaseCRUD:
                 
             # Auto-generate slug if name is updated and model has slug field
             if ('name' in update_data and update_data['name'] and 
-                hasattr(self.model_class, 'slug') and 
+                'slug' in self._columns and 
                 ('slug' not in update_data or not update_data['slug'])):
-                update_data['slug'] = slugify(update_data['name'])
-                logger.debug(f"Auto-generated slug '{update_data['slug']}' from updated name '{update_data['name']}'")
-            
-            # Update the object with the new values
-            for key, value in update_data.items():
-                if hasattr(db_obj, key):
-                    setattr(db_obj, key, value)
+                update_data['slug'] = _slug(update_data['name'])
+                logger.debug("Auto-generated slug '%s' from updated name '%s'", update_data['slug'], update_data['name'])
+            
+            # Only table columns can be written by the UPDATE statement
+            columns = self._columns
+            values = {key: value for key, value in update_data.items() if key in columns}
+            if not values:
+                return session.get(self.model_class, id)
+            
+            statement = (
+                update(self.model_class)
+                .where(self.model_class.id == id)
+                .values(**values)
+                .returning(self.model_class)
+            )
+            db_obj = session.execute(statement).scalar_one_or_none()
+            if db_obj is None:
+                session.rollback()
+                return None
             
-            session.add(db_obj)
             session.commit()
-            session.refresh(db_obj)
             return db_obj
+        except IntegrityError as e:
+            session.rollback()
+            self._raise_conflict(e, update_data)
+            logger.error("Error updating %s: %s", self._model_name, e, exc_info=True)
+            raise
         except Exception as e:
             session.rollback()
-            logger.error(f"Error updating {self.model_class.__name__}: {str(e)}", exc_info=True)
+            logger.error("Error updating %s: %s", self._model_name, e, exc_info=True)
             raise
     
     def remove(self, db: Session, *, id: int) -> Optional[Any]:
@@ -1101,6 +1156,57 @@ class BaseCRUD:
         db.commit()
         return obj
 
+# Organizational CRUD classes - thin wrappers exposing the update_* names used by the router
+class RegionCRUD(BaseCRUD):
+    __slots__ = ()
+    
+    UNIQUE_CONSTRAINTS = {"uq_region_name": "name"}
+    
+    def __init__(self):
+        super().__init__(Region)
+    
+    def update_region(self, db: Session, id: int, obj_in) -> Optional[Region]:
+        """
+        Update a region by ID. This is a wrapper around the BaseCRUD update method.
+        """
+        return self.update(db, id, obj_in)
+
+class SiteGroupCRUD(BaseCRUD):
+    __slots__ = ()
+    
+    def __init__(self):
+        super().__init__(SiteGroup)
+    
+    def update_site_group(self, db: Session, id: int, obj_in) -> Optional[SiteGroup]:
+        """
+        Update a site group by ID. This is a wrapper around the BaseCRUD update method.
+        """
+        return self.update(db, id, obj_in)
+
+class SiteCRUD(BaseCRUD):
+    __slots__ = ()
+    
+    def __init__(self):
+        super().__init__(Site)
+    
+    def update_site(self, db: Session, id: int, obj_in) -> Optional[Site]:
+        """
+        Update a site by ID. This is a wrapper around the BaseCRUD update method.
+        """
+        return self.update(db, id, obj_in)
+
+class LocationCRUD(BaseCRUD):
+    __slots__ = ()
+    
+    def __init__(self):
+        super().__init__(Location)
+    
+    def update_location(self, db: Session, id: int, obj_in) -> Optional[Location]:
+        """
+        Update a location by ID. This is a wrapper around the BaseCRUD update method.
+        """
+        return self.update(db, id, obj_in)
+
 # Instantiate CRUD objects
 region = RegionCRUD()
 site_group = SiteGroupCRUD()
@@ -1116,43 +1222,49 @@ class AggregateCRUD:
         Get all Aggregates with optional pagination and filtering.
         """
         try:
-            logger.debug(f"AggregateCRUD get_all: skip={skip}, limit={limit}, kwargs={kwargs}")
+            # Skip building DEBUG diagnostics when they would be discarded
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("AggregateCRUD get_all: skip=%s, limit=%s, kwargs=%s", skip, limit, kwargs)
             
-            query = select(Aggregate)
+            params: Dict[str, Any] = {}
             
             # Apply filters from kwargs
+            columns = _cols(Aggregate)
             for key, value in kwargs.items():
-                if hasattr(Aggregate, key) and value is not None:
-                    logger.debug(f"Applying filter: {key}={value}")
-                    query = query.where(getattr(Aggregate, key) == value)
+                if key in columns and value is not None:
+                    if debug:
+                        logger.debug("Applying filter: %s=%s", key, value)
+                    params[key] = value
                 else:
-                    if not hasattr(Aggregate, key):
-                        logger.warning(f"Model Aggregate does not have attribute {key}")
-            
-            logger.debug(f"Executing query: {query}")
-            result = session.exec(query.offset(skip).limit(limit)).all()
-            logger.debug(f"Query returned {len(result)} results")
-            
-            # Convert IPv4Network objects to strings for serialization
-            for item in result:
-                if hasattr(item, 'prefix') and item.prefix is not None:
-                    # Ensure prefix is a string for serialization
-                    item.prefix = str(item.prefix)
-            
+                    if key not in columns:
+                        logger.warning("Model Aggregate does not have attribute %s", key)
+            
+            query = _filtered_select(Aggregate, frozenset(params))
+            params["_skip"] = skip
+            params["_limit"] = limit
+            
+            if debug:
+                logger.debug("Executing query: %s", query)
+            result = session.execute(query, params).scalars().all()
+            if debug:
+                logger.debug("Query returned %s results", len(result))
             return result
         except Exception as e:
-            logger.error(f"Error in AggregateCRUD get_all: {str(e)}", exc_info=True)
+            logger.error("Error in AggregateCRUD get_all: %s", e, exc_info=True)
             raise
     
     def get_by_id(self, session: Session, id: int) -> Optional[Aggregate]:
         """
         Get an Aggregate by its ID.
         """
-        item = session.get(Aggregate, id)
-        if item and hasattr(item, 'prefix') and item.prefix is not None:
-            # Ensure prefix is a string for serialization
-            item.prefix = str(item.prefix)
-        return item
+        return session.get(Aggregate, id)
+    
+    def get_many_by_ids(self, session: Session, ids: List[Any]) -> Dict[Any, Aggregate]:
+        """
+        Get Aggregates by ID in a single query, keyed by ID.
+        """
+        return _get_many(session, Aggregate, ids)
     
     def create(self, session: Session, obj_in: Dict[str, Any]) -> Aggregate:
         """
@@ -1161,23 +1273,23 @@ class AggregateCRUD:
         try:
             # Generate slug from name if not provided
             if 'name' in obj_in and ('slug' not in obj_in or not obj_in['slug']):
-                obj_in['slug'] = slugify(obj_in['name'])
-                logger.debug(f"Generated slug '{obj_in['slug']}' from name '{obj_in['name']}'")
+                obj_in['slug'] = _slug(obj_in['name'])
+                logger.debug("Generated slug '%s' from name '%s'", obj_in['slug'], obj_in['name'])
             
             # Create the Aggregate
             db_obj = Aggregate(**obj_in)
             session.add(db_obj)
             session.commit()
-            session.refresh(db_obj)
             
-            # Ensure prefix is a string for serialization
-            if hasattr(db_obj, 'prefix') and db_obj.prefix is not None:
-                db_obj.prefix = str(db_obj.prefix)
+            # Only the prefix is normalised by the database (CIDR), so fetch just that column
+            prefix = session.exec(select(Aggregate.prefix).where(Aggregate.id == db_obj.id)).first()
+            if prefix is not None:
+                db_obj.prefix = prefix
                 
             return db_obj
         except Exception as e:
             session.rollback()
-            logger.error(f"Error creating Aggregate: {str(e)}", exc_info=True)
+            logger.error("Error creating Aggregate: %s", e, exc_info=True)
             raise
     
     def update_aggregate(self, db: Session, id: int, obj_in) -> Optional[Aggregate]:
@@ -1185,12 +1297,6 @@ class AggregateCRUD:
         Update an Aggregate by ID, ensuring proper slug generation.
         """
         try:
-            # Get the Aggregate to update
-            db_obj = db.get(Aggregate, id)
-            if not db_obj:
-                logger.warning(f"Aggregate with ID {id} not found for update")
-                return None
-            
             # Convert Pydantic model to dict if needed
             if hasattr(obj_in, 'model_dump'):
                 # For Pydantic v2
@@ -1205,62 +1311,156 @@ class AggregateCRUD:
             # Auto-generate slug if name is updated and slug is not provided
             if ('name' in update_data and update_data['name'] and 
                 ('slug' not in update_data or not update_data['slug'])):
-                update_data['slug'] = slugify(update_data['name'])
-                logger.debug(f"Generated slug '{update_data['slug']}' from name '{update_data['name']}'")
-            
-            # Update the object with the new values
-            for key, value in update_data.items():
-                if hasattr(db_obj, key):
-                    setattr(db_obj, key, value)
+                update_data['slug'] = _slug(update_data['name'])
+                logger.debug("Generated slug '%s' from name '%s'", update_data['slug'], update_data['name'])
+            
+            # Write the new values with a single UPDATE ... RETURNING
+            values = {key: value for key, value in update_data.items() if key in _cols(Aggregate)}
+            if values:
+                db_obj = db.execute(
+                    update(Aggregate)
+                    .where(Aggregate.id == id)
+                    .values(**values)
+                    .returning(Aggregate)
+                ).scalar_one_or_none()
+            else:
+                db_obj = db.get(Aggregate, id)
+            if not db_obj:
+                db.rollback()
+                logger.warning("Aggregate with ID %s not found for update", id)
+                return None
             
-            db.add(db_obj)
             db.commit()
-            db.refresh(db_obj)
-            
-            # Ensure prefix is a string for serialization
-            if hasattr(db_obj, 'prefix') and db_obj.prefix is not None:
-                db_obj.prefix = str(db_obj.prefix)
-                
             return db_obj
         except Exception as e:
             db.rollback()
-            logger.error(f"Error updating Aggregate: {str(e)}", exc_info=True)
+            logger.error("Error updating Aggregate: %s", e, exc_info=True)
             raise
+# VRF responses include the route targets: load them for the whole page in two
+# queries, and refuse any other lazy load instead of issuing one SELECT per row
+_VRF_TARGET_OPTIONS = (
+    selectinload(VRF.import_targets),
+    selectinload(VRF.export_targets),
+)
+_VRF_LOAD_OPTIONS = _VRF_TARGET_OPTIONS + (raiseload('*'),)
+
+def _sync_vrf_targets(session: Session, link_model, vrf_id: Any, target_ids: Iterable[Any]) -> None:
+    """
+    Make the route-target links of a VRF in link_model match target_ids.
+    
+    Two statements, without reading the current links first: one DELETE of the links
+    not in target_ids, then one multi-row INSERT ... ON CONFLICT DO NOTHING, so links
+    that already exist are left untouched rather than deleted and re-inserted.
+    """
+    wanted = list(dict.fromkeys(target_ids))
+    
+    statement = delete(link_model).where(link_model.vrf_id == vrf_id)
+    if wanted:
+        statement = statement.where(link_model.route_target_id.not_in(wanted))
+    session.execute(statement.execution_options(synchronize_session=False))
+    
+    if wanted:
+        session.execute(
+            pg_insert(link_model)
+            .values([{"vrf_id": vrf_id, "route_target_id": rt_id} for rt_id in wanted])
+            .on_conflict_do_nothing(index_elements=["vrf_id", "route_target_id"])
+        )
+
 class VRFCRUD:
     """
     CRUD operations for VRF model with special handling for route targets.
     """
-    def get_all(self, session: Session, skip: int = 0, limit: int = 100, **kwargs) -> list[VRF]:
+    def get_all(self, session: Session, skip: int = 0, limit: int = 100, after_id: Optional[Any] = None, stream: bool = False, with_total: bool = False, **kwargs) -> Any:
         """
         Get all VRFs with optional pagination and filtering.
+        
+        Pass after_id (the id of the last VRF of the previous page) for keyset
+        pagination in id order; skip is then ignored. Ids are random uuid4 values, so
+        cursor pages walk a stable but arbitrary order, not creation order. Offset
+        pagination with skip remains for existing callers.
+        
+        With stream=True an iterator is returned that fetches VRFs (and their route
+        targets, per batch) from a server-side cursor in batches of STREAM_BATCH_SIZE.
+        It must be consumed while the session is open.
+        
+        With with_total=True an (items, total) tuple is returned, where total is the
+        number of VRFs matching the filters. It is computed in the same query with
+        count(*) OVER (), so paginated listings don't need a separate COUNT. Only
+        supported for offset pages.
         """
+        if with_total and (after_id is not None or stream):
+            raise ValueError("with_total is only supported for offset pages")
         try:
-            logger.debug(f"VRFCRUD get_all: skip={skip}, limit={limit}, kwargs={kwargs}")
+            # Skip building DEBUG diagnostics when they would be discarded
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("VRFCRUD get_all: skip=%s, limit=%s, after_id=%s, kwargs=%s", skip, limit, after_id, kwargs)
             
-            query = select(VRF)
+            params: Dict[str, Any] = {}
             
             # Apply filters from kwargs
+            columns = _cols(VRF)
             for key, value in kwargs.items():
-                if hasattr(VRF, key) and value is not None:
-                    logger.debug(f"Applying filter: {key}={value}")
-                    query = query.where(getattr(VRF, key) == value)
+                if key in columns and value is not None:
+                    if debug:
+                        logger.debug("Applying filter: %s=%s", key, value)
+                    params[key] = value
                 else:
-                    if not hasattr(VRF, key):
-                        logger.warning(f"Model VRF does not have attribute {key}")
+                    if key not in columns:
+                        logger.warning("Model VRF does not have attribute %s", key)
             
-            logger.debug(f"Executing query: {query}")
-            result = session.exec(query.offset(skip).limit(limit)).all()
-            logger.debug(f"Query returned {len(result)} results")
+            if after_id is not None:
+                query = _filtered_select(VRF, frozenset(params), _VRF_LOAD_OPTIONS, keyset=True)
+                params["_after_id"] = after_id
+            else:
+                query = _filtered_select(VRF, frozenset(params), _VRF_LOAD_OPTIONS, with_total=with_total)
+                params["_skip"] = skip
+            params["_limit"] = limit
+            
+            if debug:
+                logger.debug("Executing query: %s with params %s", query, params)
+            if stream:
+                return session.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE), params).scalars()
+            if with_total:
+                rows = session.execute(query, params).all()
+                result = [row[0] for row in rows]
+                if rows:
+                    total = rows[0].total
+                elif skip:
+                    # A page past the end has no row to carry the total
+                    total = session.execute(
+                        select(func.count()).select_from(VRF).where(*(getattr(VRF, key) == value for key, value in params.items() if not key.startswith("_")))
+                    ).scalar_one()
+                else:
+                    total = 0
+                if debug:
+                    logger.debug("Query returned %s results, total: %s", len(result), total)
+                return result, total
+            result = session.execute(query, params).scalars().all()
+            if debug:
+                logger.debug("Query returned %s results", len(result))
             return result
         except Exception as e:
-            logger.error(f"Error in VRFCRUD get_all: {str(e)}", exc_info=True)
+            logger.error("Error in VRFCRUD get_all: %s", e, exc_info=True)
             raise
     
-    def get_by_id(self, session: Session, id: int) -> Optional[VRF]:
+    def get_by_id(self, session: Session, id: int, *, columns: Optional[tuple] = None) -> Optional[VRF]:
         """
-        Get a VRF by its ID.
+        Get a VRF by its ID, or only the given columns of it.
+        
+        The route targets are loaded with the VRF (one extra query each) since the
+        detail response includes them.
+        """
+        if not columns:
+            statement = select(VRF).options(*_VRF_TARGET_OPTIONS).where(VRF.id == id)
+            return session.execute(statement).scalar_one_or_none()
+        return _get_columns(session, VRF, id, columns)
+    
+    def get_many_by_ids(self, session: Session, ids: List[Any]) -> Dict[Any, VRF]:
+        """
+        Get VRFs by ID in a single query, keyed by ID.
         """
-        return session.get(VRF, id)
+        return _get_many(session, VRF, ids)
     
     def create(self, session: Session, obj_in: Dict[str, Any]) -> VRF:
         """
@@ -1273,33 +1473,76 @@ class VRFCRUD:
             
             # Generate slug from name if not provided
             if 'name' in obj_in and ('slug' not in obj_in or not obj_in['slug']):
-                obj_in['slug'] = slugify(obj_in['name'])
-                logger.debug(f"Generated slug '{obj_in['slug']}' from name '{obj_in['name']}'")
+                obj_in['slug'] = _slug(obj_in['name'])
+                logger.debug("Generated slug '%s' from name '%s'", obj_in['slug'], obj_in['name'])
             
-            # Create the VRF
-            db_obj = VRF(**obj_in)
-            session.add(db_obj)
-            session.flush()  # Get the ID without committing
+            # Create the VRF with INSERT ... RETURNING; the id is available without a flush
+            db_obj = _insert_row(session, VRF, obj_in)
             
-            # Add import targets
+            # Add import targets with a single executemany INSERT
             if import_target_ids:
-                for rt_id in import_target_ids:
-                    import_link = VRFImportTargets(vrf_id=db_obj.id, route_target_id=rt_id)
-                    session.add(import_link)
+                session.execute(
+                    insert(VRFImportTargets),
+                    [{"vrf_id": db_obj.id, "route_target_id": rt_id} for rt_id in import_target_ids]
+                )
             
-            # Add export targets
+            # Add export targets with a single executemany INSERT
             if export_target_ids:
-                for rt_id in export_target_ids:
-                    export_link = VRFExportTargets(vrf_id=db_obj.id, route_target_id=rt_id)
-                    session.add(export_link)
+                session.execute(
+                    insert(VRFExportTargets),
+                    [{"vrf_id": db_obj.id, "route_target_id": rt_id} for rt_id in export_target_ids]
+                )
             
             # Commit all changes
             session.commit()
-            session.refresh(db_obj)
             return db_obj
         except Exception as e:
             session.rollback()
-            logger.error(f"Error creating VRF: {str(e)}", exc_info=True)
+            logger.error("Error creating VRF: %s", e, exc_info=True)
+            raise
+    
+    def bulk_create(self, session: Session, rows: List[Dict[str, Any]]) -> List[VRF]:
+        """
+        Create many VRFs with their import and export targets in a single transaction.
+        
+        VRF ids are generated client-side, so the link rows are known up front: the
+        VRFs and each link table are written with one executemany INSERT apiece, and
+        the created VRFs are read back with their targets in one query.
+        """
+        try:
+            values = []
+            import_links = []
+            export_links = []
+            for obj_in in rows:
+                import_target_ids = obj_in.pop('import_target_ids', None) or []
+                export_target_ids = obj_in.pop('export_target_ids', None) or []
+                if obj_in.get('name') and not obj_in.get('slug'):
+                    obj_in['slug'] = _slug(obj_in['name'])
+                
+                # Build the model for its Python-side defaults (id, timestamps)
+                db_obj = VRF(**obj_in)
+                values.append({key: getattr(db_obj, key) for key in _cols(VRF)})
+                import_links.extend({"vrf_id": db_obj.id, "route_target_id": rt_id} for rt_id in import_target_ids)
+                export_links.extend({"vrf_id": db_obj.id, "route_target_id": rt_id} for rt_id in export_target_ids)
+            
+            if not values:
+                return []
+            session.execute(insert(VRF), values)
+            if import_links:
+                session.execute(insert(VRFImportTargets), import_links)
+            if export_links:
+                session.execute(insert(VRFExportTargets), export_links)
+            session.commit()
+            
+            ids = [value["id"] for value in values]
+            created = session.execute(
+                select(VRF).where(VRF.id.in_(ids)).options(*_VRF_TARGET_OPTIONS)
+            ).scalars().all()
+            by_id = {obj.id: obj for obj in created}
+            return [by_id[id] for id in ids]
+        except Exception as e:
+            session.rollback()
+            logger.error("Error bulk creating VRFs: %s", e, exc_info=True)
             raise
     
     def update_vrf(self, db: Session, vrf_id: int, vrf_in) -> Optional[VRF]:
@@ -1307,76 +1550,48 @@ class VRFCRUD:
         Update a VRF by ID, including import and export targets.
         """
         try:
-            # Get the VRF to update
-            db_obj = db.get(VRF, vrf_id)
-            if not db_obj:
-                logger.warning(f"VRF with ID {vrf_id} not found for update")
-                return None
-            
-            # Convert Pydantic model to dict if needed
-            if hasattr(vrf_in, 'model_dump'):
-                # For Pydantic v2
-                vrf_dict = vrf_in.model_dump(exclude_unset=True)
-            elif hasattr(vrf_in, 'dict'):
-                # For Pydantic v1
-                vrf_dict = vrf_in.dict(exclude_unset=True)
-            else:
-                # Already a dict
-                vrf_dict = vrf_in
-            
-            # Extract route target IDs
-            import_target_ids = None
-            export_target_ids = None
+            # Convert the Pydantic (v2) model to a dict of the fields that were set
+            vrf_dict = vrf_in if isinstance(vrf_in, dict) else vrf_in.model_dump(exclude_unset=True)
             
-            if hasattr(vrf_in, 'import_target_ids'):
-                import_target_ids = vrf_in.import_target_ids
-            elif 'import_target_ids' in vrf_dict:
-                import_target_ids = vrf_dict.pop('import_target_ids', None)
-                
-            if hasattr(vrf_in, 'export_target_ids'):
-                export_target_ids = vrf_in.export_target_ids
-            elif 'export_target_ids' in vrf_dict:
-                export_target_ids = vrf_dict.pop('export_target_ids', None)
+            # Extract route target IDs; None leaves the existing targets untouched
+            import_target_ids = vrf_dict.pop('import_target_ids', None)
+            export_target_ids = vrf_dict.pop('export_target_ids', None)
             
             # Update slug if name is changing
             if 'name' in vrf_dict and vrf_dict['name']:
-                vrf_dict['slug'] = slugify(vrf_dict['name'])
-                logger.debug(f"Generated slug '{vrf_dict['slug']}' from name '{vrf_dict['name']}'")
+                vrf_dict['slug'] = _slug(vrf_dict['name'])
+                logger.debug("Generated slug '%s' from name '%s'", vrf_dict['slug'], vrf_dict['name'])
+            
+            # Update basic VRF fields with a single UPDATE ... RETURNING instead of
+            # loading the VRF and setting attributes one by one
+            columns = _cols(VRF)
+            values = {key: value for key, value in vrf_dict.items() if key in columns and value is not None}
+            if values:
+                statement = update(VRF).where(VRF.id == vrf_id).values(**values).returning(VRF)
+                db_obj = db.execute(statement).scalar_one_or_none()
+            else:
+                db_obj = db.get(VRF, vrf_id)
             
-            # Update basic VRF fields
-            for key, value in vrf_dict.items():
-                if hasattr(db_obj, key) and value is not None:
-                    setattr(db_obj, key, value)
+            if db_obj is None:
+                db.rollback()
+                logger.warning("VRF with ID %s not found for update", vrf_id)
+                return None
             
             # Update import targets if provided
             if import_target_ids is not None:
-                # Remove existing import targets
-                db.query(VRFImportTargets).filter(VRFImportTargets.vrf_id == vrf_id).delete()
-                
-                # Add new import targets
-                for rt_id in import_target_ids:
-                    import_link = VRFImportTargets(vrf_id=vrf_id, route_target_id=rt_id)
-                    db.add(import_link)
+                _sync_vrf_targets(db, VRFImportTargets, vrf_id, import_target_ids)
             
             # Update export targets if provided
             if export_target_ids is not None:
-                # Remove existing export targets
-                db.query(VRFExportTargets).filter(VRFExportTargets.vrf_id == vrf_id).delete()
-                
-                # Add new export targets
-                for rt_id in export_target_ids:
-                    export_link = VRFExportTargets(vrf_id=vrf_id, route_target_id=rt_id)
-                    db.add(export_link)
+                _sync_vrf_targets(db, VRFExportTargets, vrf_id, export_target_ids)
             
             # Commit all changes
-            db.add(db_obj)
             db.commit()
-            db.refresh(db_obj)
             
             return db_obj
         except Exception as e:
             db.rollback()
-            logger.error(f"Error updating VRF {vrf_id}: {str(e)}", exc_info=True)
+            logger.error("Error updating VRF %s: %s", vrf_id, e, exc_info=True)
             raise
     
     def remove(self, db: Session, *, id: int) -> Optional[VRF]:
@@ -1388,9 +1603,15 @@ class VRFCRUD:
             if not obj:
                 return None
             
-            # Delete related import/export targets
-            db.query(VRFImportTargets).filter(VRFImportTargets.vrf_id == id).delete()
-            db.query(VRFExportTargets).filter(VRFExportTargets.vrf_id == id).delete()
+            # Delete related import/export targets in one statement: the import link
+            # delete runs as a data-modifying CTE of the export link delete
+            import_delete = delete(VRFImportTargets).where(VRFImportTargets.vrf_id == id).cte("import_delete")
+            db.execute(
+                delete(VRFExportTargets)
+                .where(VRFExportTargets.vrf_id == id)
+                .add_cte(import_delete)
+                .execution_options(synchronize_session=False)
+            )
             
             # Delete the VRF
             db.delete(obj)
@@ -1398,12 +1619,14 @@ class VRFCRUD:
             return obj
         except Exception as e:
             db.rollback()
-            logger.error(f"Error deleting VRF {id}: {str(e)}", exc_info=True)
+            logger.error("Error deleting VRF %s: %s", id, e, exc_info=True)
             raise
 
 vrf = VRFCRUD()
 # Create a custom RIR CRUD class that includes the update_rir method
 class RIRCRUD(BaseCRUD):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(RIR)
     
@@ -1419,6 +1642,8 @@ aggregate = AggregateCRUD()
 
 # Create a custom Role CRUD class that includes the update_role method
 class RoleCRUD(BaseCRUD):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(Role)
     
@@ -1426,7 +1651,7 @@ class RoleCRUD(BaseCRUD):
         """
         Update a role by ID. This is a wrapper around the BaseCRUD update method.
         """
-        logger.debug(f"RoleCRUD update_role: id={id}, obj_in={obj_in}")
+        logger.debug("RoleCRUD update_role: id=%s, obj_in=%s", id, obj_in)
         return self.update(db, id, obj_in)
 
 # Instantiate the Role CRUD object
@@ -1436,6 +1661,8 @@ ip_range = BaseCRUD(IPRange)
 ip_address = IPAddressCRUD()
 # Create a custom TenantCRUD class that includes the update_tenant method
 class TenantCRUD(BaseCRUD):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(Tenant)
     
@@ -1451,6 +1678,8 @@ interface = BaseCRUD(Interface)
 
 # Create a custom VLAN CRUD class that includes the update_vlan method
 class VLANCRUD(BaseCRUD):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(VLAN)
     
@@ -1458,7 +1687,7 @@ class VLANCRUD(BaseCRUD):
         """
         Update a VLAN by ID. This is a wrapper around the BaseCRUD update method.
         """
-        logger.debug(f"VLANCRUD update_vlan: id={id}, obj_in={obj_in}")
+        logger.debug("VLANCRUD update_vlan: id=%s, obj_in=%s", id, obj_in)
         return self.update(db, id, obj_in)
 
 # Instantiate the VLAN CRUD object
@@ -1466,23 +1695,26 @@ vlan = VLANCRUD()
 
 # Create a custom VLANGroup CRUD class that includes the update_vlan_group method
 class VLANGroupCRUD(BaseCRUD):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(VLANGroup)
     
     def create(self, session: Session, obj_in: Dict[str, Any]) -> VLANGroup:
         """
-        Create a new VLAN group with validation for unique name-site pair.
+        Create a new VLAN group, reporting a duplicate id as 409 and an unknown site as 400.
         """
         try:
             # Create the VLANGroup
-            db_obj = VLANGroup(**obj_in)
-            session.add(db_obj)
+            db_obj = _insert_row(session, VLANGroup, obj_in)
             session.commit()
-            session.refresh(db_obj)
             return db_obj
         except IntegrityError as e:
             session.rollback()
-            raise HTTPException(status_code=409, detail=f"VLAN group creation failed: {str(e)}")
+            status_code, detail = _VLAN_GROUP_INTEGRITY_ERRORS.get(
+                _constraint_name(e), (409, "VLAN group conflict")
+            )
+            raise HTTPException(status_code=status_code, detail=detail)
     
     def update_vlan_group(self, db: Session, id: int, obj_in):
         return self.update(db, id, obj_in)
@@ -1496,4 +1728,3 @@ credential = CredentialCRUD()
 platform_type = PlatformTypeCRUD()
 net_job = NetJobCRUD()
 device_inventory = DeviceInventoryCRUD()
-ip_address = IPAddressCRUD()
@@ -4,13 +4,36 @@ from .config import settings
 # Export this for Alembic
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
+ENGINE_OPTIONS = dict(
     pool_pre_ping=True,  # Enable connection health checks
-    pool_size=5,         # Set the connection pool size
-    max_overflow=10      # Allow up to 10 connections beyond pool_size
+    pool_size=settings.DB_POOL_SIZE,        # Persistent connections kept in the pool
+    max_overflow=settings.DB_MAX_OVERFLOW,  # Extra connections allowed under burst load
+    pool_use_lifo=True,  # Reuse the most recently returned (warm) connection first
+    pool_recycle=1800,   # Replace connections older than 30 minutes
+    # Send executemany INSERTs as multi-row VALUES pages and other
+    # executemany statements through psycopg2's execute_batch
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    executemany_batch_page_size=500
+)
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **ENGINE_OPTIONS)
+
+# Read-only endpoints go to the replica when one is configured
+readonly_engine = (
+    create_engine(settings.DATABASE_REPLICA_URL, **ENGINE_OPTIONS)
+    if settings.DATABASE_REPLICA_URL else engine
 )
 
 def get_session():
-    with Session(engine) as session:
+    # Keep loaded attributes after commit so CRUD writes don't need a refresh SELECT
+    with Session(engine, expire_on_commit=False) as session:
         yield session
+
+def get_readonly_session():
+    # READ ONLY transactions, so PostgreSQL rejects writes and a replica can serve them.
+    # Without autoflush a stray attribute change can't turn a read into an UPDATE
+    with readonly_engine.connect() as connection:
+        connection.execution_options(postgresql_readonly=True)
+        with Session(bind=connection, autoflush=False, expire_on_commit=False) as session:
+            yield session
@@ -1,3 +1,3 @@
-from .handlers import validation_exception_handler, general_exception_handler
+from .handlers import validation_exception_handler, integrity_exception_handler, general_exception_handler
 
-__all__ = ["validation_exception_handler", "general_exception_handler"]
+__all__ = ["validation_exception_handler", "integrity_exception_handler", "general_exception_handler"]
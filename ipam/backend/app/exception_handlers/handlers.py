@@ -1,38 +1,200 @@
-from fastapi import Request, HTTPException
+from fastapi import Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from sqlmodel import Session
 from ..database import engine
-from ..models import VRF, Site, VLANGroup
+from ..utils import CustomJSONResponse
+from ..models import VRF, Site, VLANGroup, RIR
+from psycopg2.errors import CheckViolation, ForeignKeyViolation, UniqueViolation
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Dict, Optional, Tuple
 import logging
 import re
+import time
+import uuid
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Key columns and values of a unique violation's DETAIL line, matched in one pass:
+# Key (prefix, vrf_id)=(10.0.0.0/24, 1) already exists.
+_DETAIL_RE = re.compile(r"Key \((?P<cols>[^)]+)\)=\((?P<vals>.*)\) already exists")
+# Constraint name in a rendered violation message
+_CONSTRAINT_RE = re.compile(r'constraint "([^"]+)"')
+# Markers of a constraint error in a rendered message, found in a single scan
+_PG_ERROR_RE = re.compile(r"UniqueViolation|duplicate key|ForeignKeyViolation|CheckViolation")
+
+# Unique violations with a dedicated message, keyed by the DETAIL key columns, or by
+# (columns, constraint name) where several constraints share the same columns.
+# "fields" names the DETAIL values in order. "lookup" resolves the last value, a
+# foreign key, to a display name: (model, response field, fallback name).
+_UNIQUE_HANDLERS: Dict[Any, Dict[str, Any]] = {
+    ("prefix", "vrf_id"): {
+        "constraint": "uq_prefix_vrf",
+        "fields": ("prefix", "vrf_id"),
+        "lookup": (VRF, "vrf_name", "Unknown VRF"),
+        "detail": "The prefix {prefix} already exists in {vrf_name}. Please use a different prefix or VRF.",
+    },
+    ("address", "vrf_id"): {
+        "constraint": "uq_ipaddress_vrf",
+        "fields": ("address", "vrf_id"),
+        "lookup": (VRF, "vrf_name", "Unknown VRF"),
+        "detail": "The IP address {address} already exists in {vrf_name}. Please use a different IP address or VRF.",
+    },
+    ("vid", "site_id"): {
+        "constraint": "uq_vlan_vid_site",
+        "fields": ("vid", "site_id"),
+        "lookup": (Site, "site_name", "Unknown Site"),
+        "detail": "VLAN with VID {vid} already exists at site {site_name}. Please use a different VID or site.",
+    },
+    ("vid", "group_id"): {
+        "constraint": "uq_vlan_vid_group",
+        "fields": ("vid", "group_id"),
+        "lookup": (VLANGroup, "group_name", "Unknown Group"),
+        "detail": "VLAN with VID {vid} already exists in group {group_name}. Please use a different VID or group.",
+    },
+    ("name", "site_id"): {
+        "constraint": "uq_vlan_name_site",
+        "fields": ("name", "site_id"),
+        "lookup": (Site, "site_name", "Unknown Site"),
+        "detail": "VLAN with name '{name}' already exists at site {site_name}. Please use a different name or site.",
+    },
+    ("name", "group_id"): {
+        "constraint": "uq_vlan_name_group",
+        "fields": ("name", "group_id"),
+        "lookup": (VLANGroup, "group_name", "Unknown Group"),
+        "detail": "VLAN with name '{name}' already exists in group {group_name}. Please use a different name or group.",
+    },
+    ("asn",): {
+        "constraint": "asn_asn_key",
+        "fields": ("asn",),
+        "detail": "ASN {asn} already exists. Please use a different ASN.",
+    },
+    (("name",), "vrf_name_key"): {
+        "constraint": "vrf_name_key",
+        "fields": ("name",),
+        "detail": "VRF with name '{name}' already exists. Please use a different name.",
+    },
+    ("rd",): {
+        "constraint": "vrf_rd_key",
+        "fields": ("rd",),
+        "detail": "VRF with Route Distinguisher '{rd}' already exists. Please use a different RD.",
+    },
+    ("start_address", "end_address", "vrf_id"): {
+        "constraint": "uq_iprange_vrf",
+        "fields": ("start_address", "end_address", "vrf_id"),
+        "lookup": (VRF, "vrf_name", "Unknown VRF"),
+        "detail": "IP Range {start_address}-{end_address} already exists in {vrf_name}. Please use a different range or VRF.",
+    },
+    ("start", "end", "rir_id"): {
+        "constraint": "uq_asnrange_rir",
+        "fields": ("start", "end", "rir_id"),
+        "lookup": (RIR, "rir_name", "Unknown RIR"),
+        "detail": "ASN Range {start}-{end} already exists in {rir_name}. Please use a different range or RIR.",
+    },
+    (("name",), "uq_region_name"): {
+        "constraint": "uq_region_name",
+        "fields": ("name",),
+        "detail": "Region with name '{name}' already exists. Please use a different name.",
+    },
+}
+# The IP address model stores its address in ipv4_address
+_UNIQUE_HANDLERS[("ipv4_address", "vrf_id")] = _UNIQUE_HANDLERS[("address", "vrf_id")]
+
+# Display names resolved by _resolve_fk, as (model name, id) -> (resolved at, name).
+# Entries live for FK_NAME_TTL seconds so a burst of duplicate inserts against the
+# same VRF or site costs one lookup; the cache is dropped when it reaches its bound.
+FK_NAME_TTL = 30.0
+FK_NAME_CACHE_SIZE = 1024
+_fk_name_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+
+def _resolve_fk(model, id_value: str, fallback: str) -> str:
+    """
+    Display name of the model row with the given id, or fallback if it can't be found.
+    """
+    key = (model.__name__, id_value)
+    now = time.monotonic()
+    hit = _fk_name_cache.get(key)
+    if hit and now - hit[0] < FK_NAME_TTL:
+        return hit[1]
+    
+    name = fallback
+    try:
+        with Session(engine) as session:
+            obj = session.get(model, uuid.UUID(id_value))
+            if obj:
+                name = obj.name
+    except Exception as e:
+        logger.error("Error getting %s name: %s", model.__name__, e)
+        return fallback
+    
+    if len(_fk_name_cache) >= FK_NAME_CACHE_SIZE:
+        _fk_name_cache.clear()
+    _fk_name_cache[key] = (now, name)
+    return name
+
+async def _unique_violation_response(spec: Dict[str, Any], vals: tuple) -> CustomJSONResponse:
+    """
+    409 response for a unique violation described by a _UNIQUE_HANDLERS entry.
+    
+    The display-name lookup uses the synchronous engine, so it runs in the threadpool
+    rather than blocking the event loop.
+    """
+    fields = dict(zip(spec["fields"], vals))
+    lookup = spec.get("lookup")
+    if lookup:
+        model, name_field, fallback = lookup
+        fields[name_field] = await run_in_threadpool(_resolve_fk, model, vals[-1], fallback)
+    return CustomJSONResponse(
+        status_code=409,
+        content={
+            "detail": spec["detail"].format_map(fields),
+            "error_type": "unique_violation",
+            "constraint": spec["constraint"],
+            **fields
+        }
+    )
+
+# Constraint errors by psycopg2 exception class
+_PG_ERROR_KINDS = {
+    UniqueViolation: "unique",
+    ForeignKeyViolation: "foreign_key",
+    CheckViolation: "check",
+}
+
+# Constraint errors by the _PG_ERROR_RE marker found in a rendered message
+_PG_MARKER_KINDS = {
+    "UniqueViolation": "unique",
+    "duplicate key": "unique",
+    "ForeignKeyViolation": "foreign_key",
+    "CheckViolation": "check",
+}
+
+def _db_error_kind(exc: Exception, error_message: str) -> Optional[str]:
+    """
+    Kind of constraint error behind exc: "unique", "foreign_key", "check" or None.
+    
+    SQLAlchemy errors carry the driver exception in .orig and are classified by its
+    class; only exceptions without one (wrapped or re-raised) are matched on the message.
+    """
+    orig = getattr(exc, "orig", None)
+    if orig is not None:
+        return _PG_ERROR_KINDS.get(type(orig))
+    marker = _PG_ERROR_RE.search(error_message)
+    return _PG_MARKER_KINDS[marker.group()] if marker else None
+
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """
     Handle validation errors and log them in detail
     """
     # Log the error details
     error_details = exc.errors()
-    logger.error(f"Validation error: {str(exc)}")
-    logger.error(f"Validation error details: {error_details}")
+    logger.error("Validation error: %s details=%s", exc, error_details)
     
     # Create a more user-friendly error message
-    user_friendly_errors = []
-    for error in error_details:
-        loc = " -> ".join([str(l) for l in error.get("loc", [])])
-        msg = error.get("msg", "")
-        typ = error.get("type", "")
-        user_friendly_errors.append(f"Location: {loc}, Message: {msg}, Type: {typ}")
-    
-    # Log the request details
-    logger.error(f"Request URL: {request.url}")
-    logger.error(f"Request method: {request.method}")
-    logger.error(f"Request query params: {request.query_params}")
-    logger.error(f"Request headers: {dict(request.headers)}")
+    user_friendly_errors = [
+        f"Location: {' -> '.join(map(str, error.get('loc', ())))}, Message: {error.get('msg', '')}, Type: {error.get('type', '')}"
+        for error in error_details
+    ]
     
     # Try to get the request body without consuming the stream
     try:
@@ -42,420 +204,51 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     except Exception as e:
         body = f"Error reading body: {str(e)}"
     
-    logger.error(f"Request body: {body}")
+    # Log the request details as one record
+    logger.error(
+        "Request URL: %s\nRequest method: %s\nRequest query params: %s\nRequest headers: %s\nRequest body: %s",
+        request.url, request.method, request.query_params, request.headers, body
+    )
     
-    return JSONResponse(
+    return CustomJSONResponse(
         status_code=422,
         content={"detail": user_friendly_errors},
     )
 
-async def general_exception_handler(request: Request, exc: Exception):
+async def _constraint_error_response(exc: Exception, error_message: str, error_kind: Optional[str]) -> CustomJSONResponse:
     """
-    Handle all other exceptions and provide user-friendly error messages
+    Response for a database error of the given kind (see _db_error_kind).
     """
-    # Log the error
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    
-    # Check for specific database errors
-    error_message = str(exc)
     status_code = 500
     
     # Handle unique constraint violations
-    if "UniqueViolation" in error_message or "duplicate key" in error_message:
+    if error_kind == "unique":
         status_code = 409  # Conflict
         
-        try:
-            # Extract the DETAIL section which contains the values
-            if "DETAIL:" in error_message:
-                detail_match = error_message.split("DETAIL:")[1].strip()
-                
-                # Handle prefix and VRF uniqueness constraint
-                if "Key (prefix, vrf_id)" in detail_match and "=" in detail_match:
-                    values_match = detail_match.split("=")[1].strip()
-                    
-                    # Parse the values to get prefix and VRF ID
-                    if "(" in values_match and ")" in values_match:
-                        values_content = values_match.strip("()").split(",")
-                        if len(values_content) >= 2:
-                            prefix_value = values_content[0].strip()
-                            vrf_id = values_content[1].strip()
-                            
-                            # Get VRF name if possible
-                            vrf_name = "Unknown VRF"
-                            try:
-                                with Session(engine) as session:
-                                    vrf = session.get(VRF, int(vrf_id))
-                                    if vrf:
-                                        vrf_name = vrf.name
-                            except Exception as e:
-                                logger.error(f"Error getting VRF name: {str(e)}")
-                            
-                            return JSONResponse(
-                                status_code=status_code,
-                                content={
-                                    "detail": f"The prefix {prefix_value} already exists in {vrf_name}. Please use a different prefix or VRF.",
-                                    "error_type": "unique_violation",
-                                    "constraint": "uq_prefix_vrf",
-                                    "prefix": prefix_value,
-                                    "vrf_id": vrf_id,
-                                    "vrf_name": vrf_name
-                                }
-                            )
-                
-                # Handle IP address and VRF uniqueness constraint
-                elif "Key (address, vrf_id)" in detail_match and "=" in detail_match:
-                    values_match = detail_match.split("=")[1].strip()
-                    
-                    # Parse the values to get address and VRF ID
-                    if "(" in values_match and ")" in values_match:
-                        values_content = values_match.strip("()").split(",")
-                        if len(values_content) >= 2:
-                            address_value = values_content[0].strip()
-                            vrf_id = values_content[1].strip()
-                            
-                            # Get VRF name if possible
-                            vrf_name = "Unknown VRF"
-                            try:
-                                with Session(engine) as session:
-                                    vrf = session.get(VRF, int(vrf_id))
-                                    if vrf:
-                                        vrf_name = vrf.name
-                            except Exception as e:
-                                logger.error(f"Error getting VRF name: {str(e)}")
-                            
-                            return JSONResponse(
-                                status_code=status_code,
-                                content={
-                                    "detail": f"The IP address {address_value} already exists in {vrf_name}. Please use a different IP address or VRF.",
-                                    "error_type": "unique_violation",
-                                    "constraint": "uq_ipaddress_vrf",
-                                    "address": address_value,
-                                    "vrf_id": vrf_id,
-                                    "vrf_name": vrf_name
-                                }
-                            )
-                
-                # Handle VLAN VID and site uniqueness constraint
-                elif "Key (vid, site_id)" in detail_match and "=" in detail_match:
-                    values_match = detail_match.split("=")[1].strip()
-                    
-                    # Parse the values to get VID and site ID
-                    if "(" in values_match and ")" in values_match:
-                        values_content = values_match.strip("()").split(",")
-                        if len(values_content) >= 2:
-                            vid_value = values_content[0].strip()
-                            site_id = values_content[1].strip()
-                            
-                            # Get site name if possible
-                            site_name = "Unknown Site"
-                            try:
-                                with Session(engine) as session:
-                                    site = session.get(Site, int(site_id))
-                                    if site:
-                                        site_name = site.name
-                            except Exception as e:
-                                logger.error(f"Error getting Site name: {str(e)}")
-                            
-                            return JSONResponse(
-                                status_code=status_code,
-                                content={
-                                    "detail": f"VLAN with VID {vid_value} already exists at site {site_name}. Please use a different VID or site.",
-                                    "error_type": "unique_violation",
-                                    "constraint": "uq_vlan_vid_site",
-                                    "vid": vid_value,
-                                    "site_id": site_id,
-                                    "site_name": site_name
-                                }
-                            )
-                
-                # Handle VLAN VID and group uniqueness constraint
-                elif "Key (vid, group_id)" in detail_match and "=" in detail_match:
-                    values_match = detail_match.split("=")[1].strip()
-                    
-                    # Parse the values to get VID and group ID
-                    if "(" in values_match and ")" in values_match:
-                        values_content = values_match.strip("()").split(",")
-                        if len(values_content) >= 2:
-                            vid_value = values_content[0].strip()
-                            group_id = values_content[1].strip()
-                            
-                            # Get group name if possible
-                            group_name = "Unknown Group"
-                            try:
-                                with Session(engine) as session:
-                                    group = session.get(VLANGroup, int(group_id))
-                                    if group:
-                                        group_name = group.name
-                            except Exception as e:
-                                logger.error(f"Error getting VLAN Group name: {str(e)}")
-                            
-                            return JSONResponse(
-                                status_code=status_code,
-                                content={
-                                    "detail": f"VLAN with VID {vid_value} already exists in group {group_name}. Please use a different VID or group.",
-                                    "error_type": "unique_violation",
-                                    "constraint": "uq_vlan_vid_group",
-                                    "vid": vid_value,
-                                    "group_id": group_id,
-                                    "group_name": group_name
-                                }
-                            )
-                
-                # Handle VLAN name and site uniqueness constraint
-                elif "Key (name, site_id)" in detail_match and "=" in detail_match:
-                    values_match = detail_match.split("=")[1].strip()
-                    
-                    # Parse the values to get name and site ID
-                    if "(" in values_match and ")" in values_match:
-                        values_content = values_match.strip("()").split(",")
-                        if len(values_content) >= 2:
-                            name_value = values_content[0].strip()
-                            site_id = values_content[1].strip()
-                            
-                            # Get site name if possible
-                            site_name = "Unknown Site"
-                            try:
-                                with Session(engine) as session:
-                                    site = session.get(Site, int(site_id))
-                                    if site:
-                                        site_name = site.name
-                            except Exception as e:
-                                logger.error(f"Error getting Site name: {str(e)}")
-                            
-                            return JSONResponse(
-                                status_code=status_code,
-                                content={
-                                    "detail": f"VLAN with name '{name_value}' already exists at site {site_name}. Please use a different name or site.",
-                                    "error_type": "unique_violation",
-                                    "constraint": "uq_vlan_name_site",
-                                    "name": name_value,
-                                    "site_id": site_id,
-                                    "site_name": site_name
-                                }
-                            )
-                
-                # Handle VLAN name and group uniqueness constraint
-                elif "Key (name, group_id)" in detail_match and "=" in detail_match:
-                    values_match = detail_match.split("=")[1].strip()
-                    
-                    # Parse the values to get name and group ID
-                    if "(" in values_match and ")" in values_match:
-                        values_content = values_match.strip("()").split(",")
-                        if len(values_content) >= 2:
-                            name_value = values_content[0].strip()
-                            group_id = values_content[1].strip()
-                            
-                            # Get group name if possible
-                            group_name = "Unknown Group"
-                            try:
-                                with Session(engine) as session:
-                                    group = session.get(VLANGroup, int(group_id))
-                                    if group:
-                                        group_name = group.name
-                            except Exception as e:
-                                logger.error(f"Error getting VLAN Group name: {str(e)}")
-                            
-                            return JSONResponse(
-                                status_code=status_code,
-                                content={
-                                    "detail": f"VLAN with name '{name_value}' already exists in group {group_name}. Please use a different name or group.",
-                                    "error_type": "unique_violation",
-                                    "constraint": "uq_vlan_name_group",
-                                    "name": name_value,
-                                    "group_id": group_id,
-                                    "group_name": group_name
-                                }
-                            )
-                
-                # Handle ASN uniqueness constraint
-                elif "Key (asn)" in detail_match and "=" in detail_match:
-                    values_match = detail_match.split("=")[1].strip()
-                    asn_value = values_match.strip()
-                    
-                    return JSONResponse(
-                        status_code=status_code,
-                        content={
-                            "detail": f"ASN {asn_value} already exists. Please use a different ASN.",
-                            "error_type": "unique_violation",
-                            "constraint": "asn_asn_key",
-                            "asn": asn_value
-                        }
-                    )
-                
-                # Handle VRF name uniqueness constraint
-                elif "Key (name)" in detail_match and "=" in detail_match and "vrf_name_key" in error_message:
-                    values_match = detail_match.split("=")[1].strip()
-                    name_value = values_match.strip()
-                    
-                    return JSONResponse(
-                        status_code=status_code,
-                        content={
-                            "detail": f"VRF with name '{name_value}' already exists. Please use a different name.",
-                            "error_type": "unique_violation",
-                            "constraint": "vrf_name_key",
-                            "name": name_value
-                        }
-                    )
-                
-                # Handle VRF RD uniqueness constraint
-                elif "Key (rd)" in detail_match and "=" in detail_match:
-                    values_match = detail_match.split("=")[1].strip()
-                    rd_value = values_match.strip()
-                    
-                    return JSONResponse(
-                        status_code=status_code,
-                        content={
-                            "detail": f"VRF with Route Distinguisher '{rd_value}' already exists. Please use a different RD.",
-                            "error_type": "unique_violation",
-                            "constraint": "vrf_rd_key",
-                            "rd": rd_value
-                        }
-                    )
-                
-                # Handle IP Range uniqueness constraint
-                elif "Key (start_address, end_address, vrf_id)" in detail_match and "=" in detail_match:
-                    values_match = detail_match.split("=")[1].strip()
-                    
-                    # Parse the values to get start_address, end_address and VRF ID
-                    if "(" in values_match and ")" in values_match:
-                        values_content = values_match.strip("()").split(",")
-                        if len(values_content) >= 3:
-                            start_address = values_content[0].strip()
-                            end_address = values_content[1].strip()
-                            vrf_id = values_content[2].strip()
-                            
-                            # Get VRF name if possible
-                            vrf_name = "Unknown VRF"
-                            try:
-                                with Session(engine) as session:
-                                    vrf = session.get(VRF, int(vrf_id))
-                                    if vrf:
-                                        vrf_name = vrf.name
-                            except Exception as e:
-                                logger.error(f"Error getting VRF name: {str(e)}")
-                            
-                            return JSONResponse(
-                                status_code=status_code,
-                                content={
-                                    "detail": f"IP Range {start_address}-{end_address} already exists in {vrf_name}. Please use a different range or VRF.",
-                                    "error_type": "unique_violation",
-                                    "constraint": "uq_iprange_vrf",
-                                    "start_address": start_address,
-                                    "end_address": end_address,
-                                    "vrf_id": vrf_id,
-                                    "vrf_name": vrf_name
-                                }
-                            )
-                
-                # Handle ASN Range uniqueness constraint
-                elif "Key (start, end, rir_id)" in detail_match and "=" in detail_match:
-                    values_match = detail_match.split("=")[1].strip()
-                    
-                    # Parse the values to get start, end and RIR ID
-                    if "(" in values_match and ")" in values_match:
-                        values_content = values_match.strip("()").split(",")
-                        if len(values_content) >= 3:
-                            start_value = values_content[0].strip()
-                            end_value = values_content[1].strip()
-                            rir_id = values_content[2].strip()
-                            
-                            # Get RIR name if possible
-                            rir_name = "Unknown RIR"
-                            try:
-                                with Session(engine) as session:
-                                    rir = session.get(RIR, int(rir_id))
-                                    if rir:
-                                        rir_name = rir.name
-                            except Exception as e:
-                                logger.error(f"Error getting RIR name: {str(e)}")
-                            
-                            return JSONResponse(
-                                status_code=status_code,
-                                content={
-                                    "detail": f"ASN Range {start_value}-{end_value} already exists in {rir_name}. Please use a different range or RIR.",
-                                    "error_type": "unique_violation",
-                                    "constraint": "uq_asnrange_rir",
-                                    "start": start_value,
-                                    "end": end_value,
-                                    "rir_id": rir_id,
-                                    "rir_name": rir_name
-                                }
-                            )
-                
-                # Handle Region name uniqueness constraint
-                elif "Key (name)" in detail_match and "=" in detail_match and "uq_region_name" in error_message:
-                    values_match = detail_match.split("=")[1].strip()
-                    name_value = values_match.strip()
-                    
-                    return JSONResponse(
-                        status_code=status_code,
-                        content={
-                            "detail": f"Region with name '{name_value}' already exists. Please use a different name.",
-                            "error_type": "unique_violation",
-                            "constraint": "uq_region_name",
-                            "name": name_value
-                        }
-                    )
-                
-                # Handle Device name uniqueness constraint
-                elif "Key (name)" in detail_match and "=" in detail_match and "uq_device_name" in error_message:
-                    values_match = detail_match.split("=")[1].strip()
-                    name_value = values_match.strip()
-                    
-                    return JSONResponse(
-                        status_code=status_code,
-                        content={
-                            "detail": f"Device with name '{name_value}' already exists. Please use a different name.",
-                            "error_type": "unique_violation",
-                            "constraint": "uq_device_name",
-                            "name": name_value
-                        }
-                    )
-                
-                # Handle Interface name uniqueness constraint
-                elif "Key (name, device_id)" in detail_match and "=" in detail_match and "uq_interface_name_device" in error_message:
-                    values_match = detail_match.split("=")[1].strip()
-                    
-                    # Parse the values to get name and device ID
-                    if "(" in values_match and ")" in values_match:
-                        values_content = values_match.strip("()").split(",")
-                        if len(values_content) >= 2:
-                            name_value = values_content[0].strip()
-                            device_id = values_content[1].strip()
-                            
-                            # Get device name if possible
-                            device_name = "Unknown Device"
-                            try:
-                                with Session(engine) as session:
-                                    device = session.get(Device, int(device_id))
-                                    if device:
-                                        device_name = device.name
-                            except Exception as e:
-                                logger.error(f"Error getting Device name: {str(e)}")
-                            
-                            return JSONResponse(
-                                status_code=status_code,
-                                content={
-                                    "detail": f"Interface with name '{name_value}' already exists on device {device_name}. Please use a different name.",
-                                    "error_type": "unique_violation",
-                                    "constraint": "uq_interface_name_device",
-                                    "name": name_value,
-                                    "device_id": device_id,
-                                    "device_name": device_name
-                                }
-                            )
-        except Exception as parse_error:
-            logger.error(f"Error parsing UniqueViolation details: {str(parse_error)}")
+        # Read the constraint name and DETAIL line from the driver's structured
+        # diagnostics; only errors without them fall back to the message text
+        diag = getattr(getattr(exc, "orig", None), "diag", None)
+        constraint_name = getattr(diag, "constraint_name", None)
+        message_detail = getattr(diag, "message_detail", None)
         
         # Extract constraint name if available
-        constraint_name = None
-        if "constraint" in error_message:
-            try:
-                constraint_match = re.search(r'constraint "([^"]+)"', error_message)
-                if constraint_match:
-                    constraint_name = constraint_match.group(1)
-            except Exception as e:
-                logger.error(f"Error extracting constraint name: {str(e)}")
+        if constraint_name is None:
+            constraint_match = _CONSTRAINT_RE.search(error_message)
+            if constraint_match:
+                constraint_name = constraint_match.group(1)
+        
+        try:
+            # Extract the key columns and values from the DETAIL line in one match
+            detail_match = _DETAIL_RE.search(message_detail or error_message)
+            if detail_match:
+                cols = tuple(col.strip() for col in detail_match.group("cols").split(","))
+                spec = _UNIQUE_HANDLERS.get(cols) or _UNIQUE_HANDLERS.get((cols, constraint_name))
+                if spec:
+                    # Split from the right so a comma inside the leading value survives
+                    vals = tuple(val.strip() for val in detail_match.group("vals").rsplit(",", len(cols) - 1))
+                    return await _unique_violation_response(spec, vals)
+        except Exception as parse_error:
+            logger.error("Error parsing UniqueViolation details: %s", parse_error)
         
         # Generic unique constraint error with constraint name if available
         response_content = {
@@ -466,29 +259,51 @@ async def general_exception_handler(request: Request, exc: Exception):
         if constraint_name:
             response_content["constraint"] = constraint_name
             
-        return JSONResponse(
+        return CustomJSONResponse(
             status_code=status_code,
             content=response_content
         )
     
     # Handle foreign key violations
-    if "ForeignKeyViolation" in error_message:
+    if error_kind == "foreign_key":
         status_code = 400  # Bad Request
-        return JSONResponse(
+        return CustomJSONResponse(
             status_code=status_code,
             content={"detail": "Referenced record does not exist."}
         )
     
     # Handle check constraint violations
-    if "CheckViolation" in error_message:
+    if error_kind == "check":
         status_code = 400  # Bad Request
-        return JSONResponse(
+        return CustomJSONResponse(
             status_code=status_code,
             content={"detail": "Data validation failed."}
         )
     
     # Default error response
-    return JSONResponse(
+    return CustomJSONResponse(
         status_code=status_code,
         content={"detail": "An error occurred while processing your request."}
     )
+
+async def integrity_exception_handler(request: Request, exc: IntegrityError):
+    """
+    Handle database integrity errors (unique, foreign key and check violations)
+    """
+    # Constraint violations are expected client errors, so the traceback is only
+    # formatted when DEBUG logging is enabled
+    logger.error("Integrity error: %s", exc)
+    logger.debug("Integrity error traceback", exc_info=exc)
+    return await _constraint_error_response(exc, str(exc), _PG_ERROR_KINDS.get(type(exc.orig)))
+
+async def general_exception_handler(request: Request, exc: Exception):
+    """
+    Handle all other exceptions and provide user-friendly error messages
+    """
+    # Log the error
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    
+    # Constraint errors that reach here were wrapped or re-raised without their
+    # IntegrityError, so they can only be recognised from the message
+    error_message = str(exc)
+    return await _constraint_error_response(exc, error_message, _db_error_kind(exc, error_message))
@@ -3,20 +3,59 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from sqlmodel import SQLModel, Session
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+import atexit
 import logging
+import queue
 import signal
+from logging.handlers import QueueHandler, QueueListener
 from typing import cast, Any, Callable
 
+from .config import settings
 from .database import engine
 from .middleware import LoggingMiddleware, TenantMiddleware
-from .exception_handlers import validation_exception_handler, general_exception_handler
+from .exception_handlers import validation_exception_handler, integrity_exception_handler, general_exception_handler
 from .utils import CustomJSONResponse
 from .api import router
+from .api.router import warm_schema_cache
 
-# Configure logging
+# Configure logging: request threads only enqueue records, and a background listener
+# thread formats and writes them through the handlers configured so far
 logging.basicConfig(level=logging.DEBUG)
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+root_logger = logging.getLogger()
+log_handlers = list(root_logger.handlers)
+for handler in log_handlers:
+    root_logger.removeHandler(handler)
+root_logger.addHandler(QueueHandler(log_queue))
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# CORS settings
+CORS_ORIGINS = ("http://localhost:5173", "http://127.0.0.1:5173")  # Allow both localhost and 127.0.0.1
+CORS_METHODS = ("GET", "POST", "PUT", "DELETE", "OPTIONS")
+CORS_EXPOSE_HEADERS = ("Content-Type", "X-Requested-With", "Accept", "Authorization")
+
+# Tenant isolation policy predicate. The scalar subqueries make the tenant lookup
+# an InitPlan evaluated once per query, not once per row
+TENANT_POLICY_USING = (
+    "tenant_id IS NULL OR "
+    "tenant_id = (SELECT app.get_current_tenant_id()) OR "
+    "(SELECT app.get_current_tenant_id()) IS NULL"
+)
+
+# Advisory lock key that serializes startup DDL across workers
+STARTUP_DDL_LOCK = "ipam_startup_ddl"
+
+# Extra columns to lead with tenant_id in the RLS covering index, for tables
+# whose common lookups filter on more than the tenant
+TENANT_INDEX_COLUMNS = {
+    "prefixes": ("prefix",),
+    "ip_addresses": ("ipv4_address",),
+}
+
 app = FastAPI(title="IPAM API")
 
 # Add logging middleware
@@ -28,11 +67,11 @@ app.add_middleware(TenantMiddleware)
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"],  # Allow both localhost and 127.0.0.1
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,  # Allow credentials
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],  # Specify allowed methods
+    allow_methods=CORS_METHODS,  # Specify allowed methods
     allow_headers=["*"],  # Allows all headers
-    expose_headers=["Content-Type", "X-Requested-With", "Accept", "Authorization"],  # Expose specific headers
+    expose_headers=CORS_EXPOSE_HEADERS,  # Expose specific headers
 )
 
 # Use our custom response class as the default
@@ -41,6 +80,7 @@ app.router.default_response_class = CustomJSONResponse
 # Add exception handlers
 # Cast the exception handlers to Any to satisfy the type checker
 app.add_exception_handler(RequestValidationError, cast(Any, validation_exception_handler))
+app.add_exception_handler(IntegrityError, cast(Any, integrity_exception_handler))
 app.add_exception_handler(Exception, cast(Any, general_exception_handler))
 
 # Include the API router
@@ -64,20 +104,29 @@ def setup_row_level_security():
     """
     logger.info("Setting up Row-Level Security for PostgreSQL...")
     with Session(engine) as session:
+        # Check the schema and function first; re-running CREATE OR REPLACE on every
+        # startup rewrites pg_proc and invalidates plans that depend on the function
+        schema_exists, function_current = session.execute(text("""
+        SELECT EXISTS (SELECT FROM pg_namespace WHERE nspname = 'app'),
+               EXISTS (SELECT FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace
+                       JOIN pg_language l ON l.oid = p.prolang
+                       WHERE n.nspname = 'app' AND p.proname = 'get_current_tenant_id'
+                         AND l.lanname = 'sql' AND p.provolatile = 's' AND p.proparallel = 's')
+        """)).one()
+
         # Create app schema if it doesn't exist
-        session.execute(text("CREATE SCHEMA IF NOT EXISTS app"))
+        if not schema_exists:
+            session.execute(text("CREATE SCHEMA IF NOT EXISTS app"))
         
-        # Create function to get current tenant ID
-        session.execute(text("""
+        # Create function to get current tenant ID, or replace an older plpgsql version.
+        # An unset or empty setting reads as NULL through NULLIF; an EXCEPTION block
+        # would need a subtransaction, which would make the function parallel unsafe
+        if not function_current:
+            session.execute(text("""
         CREATE OR REPLACE FUNCTION app.get_current_tenant_id()
         RETURNS UUID AS $$
-        BEGIN
-            RETURN current_setting('app.current_tenant_id', TRUE)::UUID;
-        EXCEPTION
-            WHEN OTHERS THEN
-                RETURN NULL;
-        END;
-        $$ LANGUAGE plpgsql;
+            SELECT NULLIF(current_setting('app.current_tenant_id', TRUE), '')::UUID;
+        $$ LANGUAGE sql STABLE PARALLEL SAFE;
         """))
         
         # Enable RLS on tables that need tenant isolation
@@ -86,57 +135,102 @@ def setup_row_level_security():
             "vrfs", "aggregates", "interfaces"
         ]
         
-        for table in tables_with_tenant_id:
-            # Check if table exists before enabling RLS
-            result = session.execute(text(
-                f"SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_schema = 'ipam' AND table_name = '{table}')"
-            ))
-            table_exists = result.scalar()
-            
-            if table_exists:
-                # Enable RLS on table
-                session.execute(text(f"ALTER TABLE ipam.{table} ENABLE ROW LEVEL SECURITY"))
-                
-                # Check if policy already exists
-                policy_name = f"tenant_isolation_{table}_policy"
-                result = session.execute(text(
-                    f"SELECT EXISTS (SELECT FROM pg_policies WHERE schemaname = 'ipam' AND tablename = '{table}' AND policyname = '{policy_name}')"
-                ))
-                policy_exists = result.scalar()
-                
-                if not policy_exists:
-                    # Create policy for data isolation
-                    session.execute(text(f"""
-                    CREATE POLICY {policy_name} ON ipam.{table}
-                    USING (
-                        tenant_id IS NULL OR 
-                        tenant_id = app.get_current_tenant_id() OR
-                        app.get_current_tenant_id() IS NULL
-                    )
-                    """))
-                    logger.info(f"RLS policy created for ipam.{table}")
-                else:
-                    logger.info(f"RLS policy already exists for ipam.{table}")
-                
-                logger.info(f"RLS enabled on ipam.{table}")
+        # Fetch table, RLS and policy state for every table in one round-trip
+        state = session.execute(
+            text("""
+            SELECT t.name,
+                   EXISTS (SELECT FROM information_schema.tables
+                           WHERE table_schema = 'ipam' AND table_name = t.name) AS table_exists,
+                   COALESCE((SELECT c.relrowsecurity FROM pg_class c
+                             WHERE c.oid = to_regclass('ipam.' || quote_ident(t.name))), FALSE) AS rls_enabled,
+                   EXISTS (SELECT FROM information_schema.columns
+                           WHERE table_schema = 'ipam' AND table_name = t.name
+                             AND column_name = 'tenant_id') AS has_tenant_id,
+                   EXISTS (SELECT FROM pg_policies
+                           WHERE schemaname = 'ipam' AND tablename = t.name
+                             AND policyname = 'tenant_isolation_' || t.name || '_policy') AS policy_exists,
+                   EXISTS (SELECT FROM pg_policies
+                           WHERE schemaname = 'ipam' AND tablename = t.name
+                             AND policyname = 'tenant_isolation_' || t.name || '_policy'
+                             AND position('SELECT app.get_current_tenant_id()' IN qual) > 0) AS policy_current
+            FROM UNNEST(CAST(:tables AS text[])) AS t(name)
+            """),
+            {"tables": tables_with_tenant_id},
+        ).all()
+
+        # Collect only the DDL that is still missing and run it as a single block.
+        # Identifiers can't be bound, so they go through the dialect's quoting
+        quote = engine.dialect.identifier_preparer.quote
+        statements = []
+        for table, table_exists, rls_enabled, has_tenant_id, policy_exists, policy_current in state:
+            if not table_exists:
+                logger.warning("Table ipam.%s does not exist, skipping RLS setup", table)
+                continue
+            if not has_tenant_id:
+                logger.warning("Table ipam.%s has no tenant_id column, skipping RLS setup", table)
+                continue
+            if not rls_enabled:
+                statements.append(f"ALTER TABLE ipam.{quote(table)} ENABLE ROW LEVEL SECURITY;")
+            policy = quote(f"tenant_isolation_{table}_policy")
+            if not policy_exists:
+                # Create policy for data isolation
+                statements.append(f"CREATE POLICY {policy} ON ipam.{quote(table)} USING ({TENANT_POLICY_USING});")
+                logger.info("RLS policy created for ipam.%s", table)
+            elif not policy_current:
+                # Policies from before the scalar-subquery form call the function per row
+                statements.append(f"ALTER POLICY {policy} ON ipam.{quote(table)} USING ({TENANT_POLICY_USING});")
+                logger.info("RLS policy updated for ipam.%s", table)
             else:
-                logger.warning(f"Table ipam.{table} does not exist, skipping RLS setup")
+                logger.info("RLS policy already exists for ipam.%s", table)
+            logger.info("RLS enabled on ipam.%s", table)
+
+        if statements:
+            session.execute(text("DO $$ BEGIN\n" + "\n".join(statements) + "\nEND $$;"))
         
         # Commit all changes
         session.commit()
-        
-        logger.info("Row-Level Security setup complete")
+
+    # Index tenant_id so the planner can push the policy predicate into an index
+    # scan; CONCURRENTLY cannot run inside a transaction block, hence autocommit
+    indexed_tables = [row[0] for row in state if row[1] and row[3]]
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for table in indexed_tables:
+            columns = ", ".join(quote(column) for column in ("tenant_id",) + TENANT_INDEX_COLUMNS.get(table, ()))
+            connection.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(f'ix_{table}_tenant_id')} ON ipam.{quote(table)} ({columns})"
+            ))
+
+    logger.info("Row-Level Security setup complete")
 
 # Create tables and RLS policies
 @app.on_event("startup")
 async def startup_event():
-    # Create tables (existing behavior)
-    logger.info("Creating database tables...")
-    SQLModel.metadata.create_all(engine)
-    logger.info("Database tables created")
+    # Schema DDL runs only where enabled, so extra workers and deployments whose
+    # schema is managed by migrations don't each repeat it on boot
+    if settings.RUN_STARTUP_DDL:
+        # Workers take the advisory lock in turn, so none serves requests before the
+        # schema and RLS policies are committed. Both steps check what already
+        # exists, so workers after the first only confirm the DDL is in place
+        with engine.connect() as lock_connection:
+            lock_connection.execute(text("SELECT pg_advisory_lock(hashtext(:key))"), {"key": STARTUP_DDL_LOCK})
+            try:
+                # Create tables (existing behavior)
+                logger.info("Creating database tables...")
+                SQLModel.metadata.create_all(engine)
+                logger.info("Database tables created")
+                
+                # Set up Row-Level Security
+                setup_row_level_security()
+            finally:
+                lock_connection.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), {"key": STARTUP_DDL_LOCK})
+    else:
+        logger.info("RUN_STARTUP_DDL is disabled, skipping table creation and RLS setup")
     
-    # Set up Row-Level Security
-    setup_row_level_security()
+    # Encode every table's schema response up front so /schema/{table_name} is a dict lookup
+    try:
+        warm_schema_cache()
+    except Exception as e:
+        logger.warning("Could not precompute table schemas, they will be loaded on demand: %s", e)
     
     logger.info("Startup complete - server ready")
 
@@ -157,7 +251,8 @@ def signal_handler(sig, frame):
     
     shutdown_initiated = True
     
-    logger.info("Shutting down backend server...")
+    # No logging here: a signal can interrupt the main thread while it holds a
+    # logging lock, so the shutdown message is logged from the shutdown event
     
     # Call the original signal handler to let the server shut down normally
     if sig == signal.SIGINT and original_sigint_handler:
@@ -174,6 +269,8 @@ signal.signal(signal.SIGTERM, signal_handler)  # Termination signal
 # Add shutdown event handler to FastAPI
 @app.on_event("shutdown")
 async def shutdown_event():
+    if shutdown_initiated:
+        logger.info("Shutting down backend server...")
     logger.info("FastAPI shutdown event triggered")
 
 # Add a simple test endpoint at the root
@@ -1,37 +1,40 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import URL, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 import time
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Create a middleware class to log requests and responses
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+# Pure ASGI middleware to log requests and responses; unlike BaseHTTPMiddleware
+# it does not wrap each request in an extra task and Request/Response objects
+class LoggingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Log request
         request_id = str(time.time())
-        logger.debug(f"Request {request_id}: {request.method} {request.url}")
+        method = scope["method"]
+        logger.debug("Request %s: %s %s", request_id, method, URL(scope=scope))
         
-        # Try to log request body for POST/PUT requests
-        if request.method in ["POST", "PUT"]:
-            try:
-                # We can't read the body directly as it will consume the stream
-                # Just log that there's a body
-                logger.debug(f"Request {request_id} has a body (not logged to avoid consuming stream)")
-            except Exception as e:
-                logger.error(f"Error with request body: {str(e)}")
+        # The body is never read here, as that would consume the stream
+        if method in ("POST", "PUT"):
+            logger.debug("Request %s has a body (not logged to avoid consuming stream)", request_id)
         
         # Log query params for all requests
-        logger.debug(f"Request {request_id} query params: {request.query_params}")
+        logger.debug("Request %s query params: %s", request_id, QueryParams(scope["query_string"]))
         
-        # Process the request
+        # Process the request, picking the status code off the response start message
         start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        
-        # Log response
-        logger.debug(f"Response {request_id}: status={response.status_code}, time={process_time:.4f}s")
-        
-        return response
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                process_time = time.time() - start_time
+                logger.debug("Response %s: status=%s, time=%.4fs", request_id, message["status"], process_time)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,25 +1,28 @@
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 import logging
 from typing import Optional
 from ..database import engine
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-class TenantMiddleware(BaseHTTPMiddleware):
+class TenantMiddleware:
     """
     Middleware to handle setting tenant context based on the authenticated user.
+
+    Written as plain ASGI rather than BaseHTTPMiddleware so requests pass straight
+    through without an extra task and Request/Response wrapping.
     """
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         # Process the request
-        response = await call_next(request)
+        await self.app(scope, receive, send)
         
         # No need to clean up PostgreSQL session variables as they're session-scoped
-        return response
 
 def get_tenant_id_from_request(request: Request) -> Optional[str]:
     """
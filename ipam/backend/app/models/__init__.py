@@ -3,7 +3,7 @@ IPAM Models package
 """
 # Base and utility models first
 from .base import BaseModel
-from .fields import IPNetworkType, IPNetworkField, ASNField, DNSNameField
+from .fields import IPNetworkType, CIDRStringType, IPNetworkField, ASNField, DNSNameField
 from .ip_constants import PrefixStatusEnum, IPRangeStatusEnum, IPAddressStatusEnum, IPAddressRoleEnum
 from .ip_utils import (
     validate_ip_network,
@@ -19,6 +19,7 @@ from .rir import RIR
 from .aggregate import Aggregate
 from .asn import ASN, ASNRange
 from .tenant import Tenant
+from .user import User
 from .role import Role
 from .vrf import VRF, RouteTarget, VRFImportTargets, VRFExportTargets
 from .site import Site
@@ -40,6 +41,7 @@ __all__ = [
     # Base and Fields
     "BaseModel",
     "IPNetworkType",
+    "CIDRStringType",
     "IPNetworkField",
     "ASNField",
     "DNSNameField",
@@ -58,6 +60,7 @@ __all__ = [
     "ASN",
     "ASNRange",
     "Tenant",
+    "User",
     "Role",
     "VRF",
     "RouteTarget",
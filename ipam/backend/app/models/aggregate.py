@@ -4,7 +4,7 @@ import uuid
 import sqlalchemy as sa
 from sqlmodel import Field, Relationship
 from .base import BaseModel
-from .fields import IPNetworkType
+from .fields import CIDRStringType
 from .ip_utils import calculate_prefix_utilization
 
 if TYPE_CHECKING:
@@ -29,7 +29,7 @@ class Aggregate(BaseModel, table=True):
     prefix: str = Field(
         ...,
         description="IPv4 or IPv6 network with mask",
-        sa_column=sa.Column(IPNetworkType)
+        sa_column=sa.Column(CIDRStringType)
     )
 
     # Foreign Keys
@@ -30,6 +30,22 @@ class IPNetworkType(TypeDecorator):
             return None
         return ip_network(value)
 
+class CIDRStringType(IPNetworkType):
+    """
+    CIDR column that loads values as the text returned by the driver.
+
+    For columns that are only ever serialized, this avoids building an
+    ip_network object per row and converting it back to str afterwards.
+    """
+
+    cache_ok = True
+
+    def process_result_value(self, value: Optional[str], dialect: Any) -> Optional[str]:
+        """Return the database value as a string."""
+        if value is None:
+            return None
+        return str(value)
+
 class IPNetworkFieldType:
     """Field type for IP networks using CIDR notation"""
     
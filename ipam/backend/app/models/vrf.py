@@ -21,8 +21,10 @@ class VRFImportTargets(SQLModel, table=True):
     vrf_id: Optional[uuid.UUID] = Field(
         default=None, foreign_key="ipam.vrfs.id", primary_key=True
     )
+    # The (vrf_id, route_target_id) primary key serves lookups by VRF; this index
+    # serves the reverse lookups by route target
     route_target_id: Optional[uuid.UUID] = Field(
-        default=None, foreign_key="ipam.route_targets.id", primary_key=True
+        default=None, foreign_key="ipam.route_targets.id", primary_key=True, index=True
     )
 
 class VRFExportTargets(SQLModel, table=True):
@@ -33,7 +35,7 @@ class VRFExportTargets(SQLModel, table=True):
         default=None, foreign_key="ipam.vrfs.id", primary_key=True
     )
     route_target_id: Optional[uuid.UUID] = Field(
-        default=None, foreign_key="ipam.route_targets.id", primary_key=True
+        default=None, foreign_key="ipam.route_targets.id", primary_key=True, index=True
     )
 
 # --- End Link Models ---
@@ -219,6 +219,13 @@ class PrefixRead(PrefixBase):
     class Config:
         from_attributes = True
     
+    # Rows carry IPv4Network/IPv6Network values; convert them here so read paths
+    # never have to write strings back onto the ORM instances
+    @field_validator('prefix', mode='before')
+    @classmethod
+    def network_to_str(cls, v):
+        return str(v) if hasattr(v, 'compressed') else v
+    
     @classmethod
     def model_validate(cls, obj, *args, **kwargs):
         """Custom validation to handle IPv4Network/IPv6Network objects"""
@@ -288,6 +295,11 @@ class IPRangeRead(IPRangeBase):
     class Config:
         from_attributes = True
         
+    @field_validator('start_address', 'end_address', mode='before')
+    @classmethod
+    def network_to_str(cls, v):
+        return str(v) if hasattr(v, 'compressed') else v
+    
     @classmethod
     def model_validate(cls, obj, *args, **kwargs):
         """Custom validation to handle IPv4Network/IPv6Network objects"""
@@ -357,6 +369,11 @@ class IPAddressRead(IPAddressBase):
     class Config:
         from_attributes = True
         
+    @field_validator('address', mode='before')
+    @classmethod
+    def network_to_str(cls, v):
+        return str(v) if hasattr(v, 'compressed') else v
+    
     @classmethod
     def model_validate(cls, obj, *args, **kwargs):
         """Custom validation to handle IPv4Network/IPv6Network objects"""
@@ -4,7 +4,7 @@ from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session, select, text
-from sqlalchemy import text as sa_text
+from sqlalchemy import String, and_, case, cast as cast_, func
 from pydantic import ValidationError
 
 from ..database import get_session
@@ -59,22 +59,24 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except (JWTError, ValidationError):
         raise credentials_exception
     
-    user = db.exec(select(User).where(User.username == token_data.username)).first()
-    if user is None:
+    # Set the PostgreSQL session variable for tenant context in the same round-trip
+    # as the user lookup. Superusers can access all tenants' data, so they get an
+    # empty string, which app.get_current_tenant_id() reads as NULL
+    tenant_context = case(
+        (and_(User.tenant_id.is_not(None), User.is_superuser.is_(False)), cast_(User.tenant_id, String)),
+        else_="",
+    )
+    row = db.exec(
+        select(User, func.set_config("app.current_tenant_id", tenant_context, False))
+        .where(User.username == token_data.username)
+    ).first()
+    if row is None:
         raise credentials_exception
+    user = row[0]
     
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
     
-    # Set PostgreSQL session variable for tenant context
-    if user.tenant_id and not user.is_superuser:
-        # Use execute instead of exec for raw SQL with sa_text
-        db.execute(sa_text(f"SET app.current_tenant_id = '{user.tenant_id}'"))
-    elif user.is_superuser:
-        # Superusers can access all tenants' data
-        # Fix: alternative approach to reset the variable - use empty string instead of NULL
-        db.execute(sa_text("RESET app.current_tenant_id"))
-    
     return user
 
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
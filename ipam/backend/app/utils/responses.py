@@ -4,6 +4,14 @@ from ipaddress import IPv4Network, IPv6Network
 from pydantic import BaseModel
 from typing import List, Any
 
+# orjson encodes in C; fall back to the stdlib encoder when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
 # Define a generic paginated response model
 class PaginatedResponse(BaseModel):
     items: List[Any]
@@ -14,6 +22,14 @@ class PaginatedResponse(BaseModel):
 # Override FastAPI's default JSONResponse to use our custom encoder
 class CustomJSONResponse(JSONResponse):
     def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            # Non-str keys are stringified and datetimes go through custom_encoder, as
+            # with the stdlib encoder. Integers beyond 64 bits fall back to the stdlib
+            # encoder. Unlike allow_nan=False, orjson writes NaN and Infinity as null
+            try:
+                return orjson.dumps(content, default=self.custom_encoder, option=ORJSON_OPTIONS)
+            except orjson.JSONEncodeError:
+                pass
         return json.dumps(
             content,
             ensure_ascii=False,
@@ -2,6 +2,11 @@ import re
 import unicodedata
 from typing import Optional
 
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7F]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_WORD_RE = re.compile(r'[^\w\-]')
+_HYPHENS_RE = re.compile(r'\-+')
+
 def slugify(text: str, max_length: Optional[int] = None) -> str:
     """
     Convert a string to a URL-friendly slug.
@@ -13,23 +18,22 @@ def slugify(text: str, max_length: Optional[int] = None) -> str:
     Returns:
         A URL-friendly slug
     """
-    # Normalize unicode characters
-    text = unicodedata.normalize('NFKD', text)
-    
-    # Remove non-ASCII characters
-    text = re.sub(r'[^\x00-\x7F]+', '', text)
+    # Normalize unicode characters and remove non-ASCII ones (plain ASCII needs neither)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = _NON_ASCII_RE.sub('', text)
     
     # Convert to lowercase
     text = text.lower()
     
     # Replace spaces with hyphens
-    text = re.sub(r'\s+', '-', text)
+    text = _WHITESPACE_RE.sub('-', text)
     
     # Remove all other non-word characters
-    text = re.sub(r'[^\w\-]', '', text)
+    text = _NON_WORD_RE.sub('', text)
     
     # Replace multiple hyphens with a single hyphen
-    text = re.sub(r'\-+', '-', text)
+    text = _HYPHENS_RE.sub('-', text)
     
     # Remove leading and trailing hyphens
     text = text.strip('-')